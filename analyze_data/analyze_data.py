@@ -1,7 +1,7 @@
 """Analyze PC build price and performance data."""
 import pandas as pd
-import matplotlib.pyplot as plt
 from config.settings import DATASET_PATH
+from analyze_data.report import build_report
 
 def load_data(filepath):
     """Load CSV data into a DataFrame."""
@@ -14,17 +14,6 @@ def describe_prices(df):
     print(df["Total Price"].describe())
 
 
-def plot_price_distribution(df):
-    """Plot a histogram of Total Price."""
-    plt.hist(df["Total Price"], bins=30, color="skyblue")
-    plt.xlabel("Total Price ($)")
-    plt.ylabel("Count")
-    plt.title("Distribution of Build Prices")
-    plt.tight_layout()
-    plt.savefig("data/price_distribution.png")
-    plt.close()
-
-
 def count_builds_by_price(df):
     """Print the number of builds in predefined price ranges."""
     bins = [0, 1000, 1500, 2500, 4000, 5000, 6000, 7000, 8000, 9000, 10000, 11000]
@@ -52,19 +41,6 @@ def show_correlation(df):
     print(df[["Total Price", "Game Score", "Work Score"]].corr())
 
 
-def plot_price_score_relation(df):
-    """Plot scatter plots of Total Price vs Game and Work Scores."""
-    plt.scatter(df["Total Price"], df["Game Score"], alpha=0.5, label="Game Score")
-    plt.scatter(df["Total Price"], df["Work Score"], alpha=0.5,
-                label="Work Score", color="orange")
-    plt.xlabel("Total Price ($)")
-    plt.ylabel("Score")
-    plt.legend()
-    plt.title("Price vs Game/Work Score")
-    plt.tight_layout()
-    plt.savefig("data/price_vs_scores.png")
-    plt.close()
-
 def show_max_min_scores(df):
     """Print maximum and minimum scores for Game and Work."""
     max_game_score = df["Game Score"].max()
@@ -126,11 +102,10 @@ def main():
     """Main function to run analysis."""
     df = load_data(DATASET_PATH)
     describe_prices(df)
-    plot_price_distribution(df)
+    build_report(df)
     count_builds_by_price(df)
     check_missing_values(df)
     show_correlation(df)
-    plot_price_score_relation(df)
     show_max_min_scores(df)
     analyze_gpu_performance(df)
     analyze_top_builds(df)
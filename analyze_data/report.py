@@ -0,0 +1,255 @@
+"""Render analysis charts in parallel into a cached static HTML/PNG report."""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = "data/report"
+MANIFEST_NAME = "manifest.json"
+# Above this many points scatter plots are drawn as hexbin density rasters,
+# whose cost does not grow with the number of artists.
+HEXBIN_THRESHOLD = 5000
+HEXBIN_GRIDSIZE = 80
+# Bump when a renderer changes so cached charts are redrawn.
+RENDER_VERSION = 1
+
+
+def render_price_distribution(df, path):
+    """
+    Draw a histogram of Total Price.
+
+    Args:
+        df (pd.DataFrame): Builds with a "Total Price" column.
+        path (str): Output PNG path.
+    """
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    counts, edges = np.histogram(df["Total Price"].dropna().to_numpy(), bins=30)
+    ax.stairs(counts, edges, fill=True, color="skyblue")
+    ax.set_xlabel("Total Price ($)")
+    ax.set_ylabel("Count")
+    ax.set_title("Distribution of Build Prices")
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def render_price_score_relation(df, path):
+    """
+    Draw Total Price against Game and Work Scores.
+
+    Small inputs keep the original overlaid scatter; large inputs are drawn
+    as one hexbin density panel per score.
+
+    Args:
+        df (pd.DataFrame): Builds with "Total Price", "Game Score" and "Work Score".
+        path (str): Output PNG path.
+    """
+    price = df["Total Price"].to_numpy()
+    game = df["Game Score"].to_numpy()
+    work = df["Work Score"].to_numpy()
+
+    if len(df) <= HEXBIN_THRESHOLD:
+        fig = Figure(figsize=(8, 5))
+        ax = fig.subplots()
+        ax.scatter(price, game, alpha=0.5, label="Game Score")
+        ax.scatter(price, work, alpha=0.5, label="Work Score", color="orange")
+        ax.set_xlabel("Total Price ($)")
+        ax.set_ylabel("Score")
+        ax.legend()
+        ax.set_title("Price vs Game/Work Score")
+    else:
+        fig = Figure(figsize=(12, 5))
+        axes = fig.subplots(1, 2, sharey=True)
+        for ax, scores, label, cmap in (
+            (axes[0], game, "Game Score", "Blues"),
+            (axes[1], work, "Work Score", "Oranges"),
+        ):
+            mask = ~(np.isnan(price) | np.isnan(scores))
+            hb = ax.hexbin(price[mask], scores[mask], gridsize=HEXBIN_GRIDSIZE,
+                           bins="log", mincnt=1, cmap=cmap)
+            fig.colorbar(hb, ax=ax, label="log10(count)")
+            ax.set_xlabel("Total Price ($)")
+            ax.set_title(f"Price vs {label}")
+        axes[0].set_ylabel("Score")
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+# name -> (renderer, input columns, title)
+CHARTS = {
+    "price_distribution": (
+        render_price_distribution, ["Total Price"], "Distribution of Build Prices"
+    ),
+    "price_vs_scores": (
+        render_price_score_relation,
+        ["Total Price", "Game Score", "Work Score"],
+        "Price vs Game/Work Score",
+    ),
+}
+
+
+def data_fingerprint(df, name):
+    """
+    Hash the columns a chart reads, together with the renderer version.
+
+    Args:
+        df (pd.DataFrame): Source data.
+        name (str): Chart name from CHARTS.
+
+    Returns:
+        str: Hex digest identifying the chart's input.
+    """
+    columns = CHARTS[name][1]
+    digest = hashlib.sha256(f"{name}:{RENDER_VERSION}:{len(df)}".encode())
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _render_chart(name, frame, path):
+    """Process pool entry point: render a single chart and return its timing."""
+    start = time.perf_counter()
+    CHARTS[name][0](frame, path)
+    return name, time.perf_counter() - start
+
+
+def _load_manifest(output_dir):
+    """Read the chart fingerprint manifest, or return an empty one."""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_html(output_dir, charts):
+    """Write index.html with every chart embedded so the file is self-contained."""
+    sections = []
+    for name in charts:
+        with open(os.path.join(output_dir, f"{name}.png"), "rb") as file:
+            encoded = base64.b64encode(file.read()).decode("ascii")
+        sections.append(
+            f"<h2>{CHARTS[name][2]}</h2>\n"
+            f'<img alt="{name}" src="data:image/png;base64,{encoded}">'
+        )
+    html_path = os.path.join(output_dir, "index.html")
+    with open(html_path, "w", encoding="utf-8") as file:
+        file.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            "<title>PC build analysis</title></head><body>\n"
+            "<h1>PC build analysis</h1>\n" + "\n".join(sections) + "\n</body></html>\n"
+        )
+    return html_path
+
+
+def build_report(df, output_dir=REPORT_DIR, max_workers=None, force=False):
+    """
+    Render all charts in a process pool and bundle them into index.html.
+
+    Charts whose input fingerprint matches the manifest from a previous run
+    are skipped.
+
+    Args:
+        df (pd.DataFrame): Build data.
+        output_dir (str): Directory for PNGs, manifest and index.html.
+        max_workers (int | None): Process pool size, defaults to one per chart.
+        force (bool): Redraw every chart regardless of the cache.
+
+    Returns:
+        str: Path to the generated index.html.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    charts = [name for name, (_, columns, _) in CHARTS.items()
+              if all(col in df.columns for col in columns)]
+
+    pending = {}
+    for name in charts:
+        fingerprint = data_fingerprint(df, name)
+        path = os.path.join(output_dir, f"{name}.png")
+        if not force and manifest.get(name) == fingerprint and os.path.exists(path):
+            logger.info(f"Chart {name} unchanged, skipping")
+            continue
+        pending[name] = (fingerprint, path)
+
+    if pending:
+        workers = max_workers or len(pending)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_render_chart, name, df[CHARTS[name][1]], path)
+                for name, (_, path) in pending.items()
+            ]
+            for future in futures:
+                name, elapsed = future.result()
+                manifest[name] = pending[name][0]
+                logger.info(f"Rendered {name} in {elapsed:.2f}s")
+
+        with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+
+    return _write_html(output_dir, charts)
+
+
+def synthetic_builds(rows, seed=0):
+    """
+    Generate a synthetic build table with realistic price/score shapes.
+
+    Args:
+        rows (int): Number of builds.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Frame with Total Price, Game Score and Work Score.
+    """
+    rng = np.random.default_rng(seed)
+    price = rng.lognormal(mean=7.6, sigma=0.5, size=rows).clip(300, 11000)
+    base = 40 * np.log(price / 250)
+    return pd.DataFrame({
+        "Total Price": price,
+        "Game Score": base + rng.normal(0, 12, rows),
+        "Work Score": base * 1.05 + rng.normal(0, 15, rows),
+    })
+
+
+def main():
+    """Build the report from the dataset, or time it on synthetic data."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=REPORT_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="ignore the chart cache")
+    parser.add_argument("--synthetic", type=int, metavar="ROWS",
+                        help="time the report on ROWS synthetic builds instead of the dataset")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.synthetic:
+        df = synthetic_builds(args.synthetic)
+        # A fresh directory guarantees the cold run cannot hit a cached manifest.
+        with tempfile.TemporaryDirectory(prefix="report_synthetic_") as output_dir:
+            for run in ("cold", "warm"):
+                start = time.perf_counter()
+                build_report(df, output_dir, args.workers)
+                print(f"{run} report for {args.synthetic} rows: "
+                      f"{time.perf_counter() - start:.2f}s")
+        return
+
+    from config.settings import DATASET_PATH
+    df = pd.read_csv(DATASET_PATH)
+    print(f"Report written to {build_report(df, args.output, args.workers, args.force)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Offline stand-ins for Telegram, Groq and Selenium used by benchmarks."""
+
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+ADVICE = (
+    "- Кулер: 120W TDP, AM5\n"
+    "- Корпус: ATX\n"
+    "- Вентилятори: 3\n"
+    "- PSU сертифікація: 80+ Gold"
+)
+
+
+# === Latency distributions ===
+
+def constant(seconds):
+    """Latency sampler that always returns the same delay."""
+    return lambda rng: seconds
+
+
+def exponential(mean):
+    """Latency sampler with exponentially distributed delays."""
+    return lambda rng: rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+
+
+def lognormal(median, sigma=0.5):
+    """Latency sampler with a heavy right tail around the given median."""
+    mu = 0.0 if median <= 0 else math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma) if median > 0 else 0.0
+
+
+LATENCY_DISTRIBUTIONS = {
+    "constant": constant,
+    "exponential": exponential,
+    "lognormal": lognormal,
+}
+
+
+# === Groq ===
+
+def fake_extraction(text):
+    """Answer an extraction prompt the way the LLM is asked to."""
+    quoted = text.split('"')[1] if text.count('"') >= 2 else text
+    number = re.search(r"\d+(?:[.,]\d+)?", quoted.replace(" ", ""))
+    task = None
+    if re.search(r"ігор|ігр|гри|гра|гейм|gam", quoted):
+        task = "games"
+    elif re.search(r"робот|work|монтаж|рендер", quoted):
+        task = "work"
+    price = float(number.group().replace(",", ".")) if number else None
+    return json.dumps({"price": price, "task": task if price else None})
+
+
+class FakeCompletions:
+    """Replacement for ``client.chat.completions`` with injected latency and errors."""
+
+    def __init__(self, latency=None, failure_rate=0.0, malformed_rate=0.0, seed=0):
+        self.latency = latency or constant(0.0)
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def create(self, model, messages, temperature):
+        """Sleep for a sampled latency and return a Groq-shaped response."""
+        self.calls += 1
+        time.sleep(self.latency(self._rng))
+        if self._rng.random() < self.failure_rate:
+            raise RuntimeError("Injected LLM failure")
+        prompt = messages[-1]["content"]
+        if prompt.startswith("Збірка:"):
+            content = ADVICE
+        elif self._rng.random() < self.malformed_rate:
+            content = "Ось JSON: {price: ???}"
+        else:
+            content = fake_extraction(prompt)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeGroqClient:
+    """Object exposing ``chat.completions.create`` like ``groq.Groq``."""
+
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(completions=FakeCompletions(**kwargs))
+
+
+@contextmanager
+def fake_llm(**kwargs):
+    """Temporarily replace the Groq client used by nlp_integration.nlp."""
+    from nlp_integration import nlp
+
+    original = nlp.CLIENT
+    nlp.CLIENT = FakeGroqClient(**kwargs)
+    try:
+        yield nlp.CLIENT
+    finally:
+        nlp.CLIENT = original
+
+
+# === Telegram ===
+
+class FakeMessage:
+    """Incoming Telegram message that records replies."""
+
+    def __init__(self, text, chat_id, reply_latency=0.0):
+        self.text = text
+        self.chat_id = chat_id
+        self.reply_latency = reply_latency
+        self.replies = []
+
+    async def reply_text(self, text, reply_markup=None, **kwargs):
+        """Record a reply, optionally simulating Bot API round-trip time."""
+        if self.reply_latency:
+            await asyncio.sleep(self.reply_latency)
+        self.replies.append(text)
+        return SimpleNamespace(text=text, chat_id=self.chat_id)
+
+
+class FakeUpdate:
+    """Minimal ``telegram.Update`` carrying a text message."""
+
+    def __init__(self, text, chat_id=1, reply_latency=0.0):
+        self.message = FakeMessage(text, chat_id, reply_latency)
+        self.effective_chat = SimpleNamespace(id=chat_id)
+        self.effective_user = SimpleNamespace(id=chat_id)
+
+
+class FakeContext:
+    """Minimal ``ContextTypes.DEFAULT_TYPE`` with user and bot data."""
+
+    def __init__(self, active=True, bot_data=None):
+        self.user_data = {"active": active}
+        self.bot_data = bot_data if bot_data is not None else {}
+
+
+class FakeBotAPI:
+    """
+    ``telegram.Bot`` stand-in that enforces Bot API flood limits.
+
+    A send that exceeds the global or per-chat rate raises ``RetryAfter``
+    instead of being delivered, like the real server does. Sends to
+    flooded_chats are always rejected, like a chat under its own flood limit.
+    """
+
+    def __init__(self, global_rate=30.0, per_chat_interval=1.0, latency=constant(0.0),
+                 retry_after=1, seed=0, flooded_chats=()):
+        self.global_rate = global_rate
+        self.per_chat_interval = per_chat_interval
+        self.latency = latency
+        self.retry_after = retry_after
+        self.flooded_chats = set(flooded_chats)
+        self.rng = random.Random(seed)
+        self.window = []
+        self.last_sent = {}
+        self.delivered = []
+        self.rejected = 0
+
+    async def send_message(self, chat_id, text, reply_markup=None, **kwargs):
+        """Deliver a message, or raise RetryAfter if it arrived over a limit."""
+        from telegram.error import RetryAfter
+
+        now = time.monotonic()
+        self.window = [sent for sent in self.window if now - sent < 1.0]
+        too_fast = now - self.last_sent.get(chat_id, -math.inf) < self.per_chat_interval
+        over_global = len(self.window) >= self.global_rate
+        await asyncio.sleep(self.latency(self.rng))
+        if too_fast or over_global or chat_id in self.flooded_chats:
+            self.rejected += 1
+            raise RetryAfter(self.retry_after)
+        self.window.append(now)
+        self.last_sent[chat_id] = now
+        self.delivered.append((now, chat_id, text))
+        return SimpleNamespace(text=text, chat_id=chat_id)
+
+
+# === Selenium ===
+
+class FakeElement:
+    """ElementTree node exposing the WebElement lookups the scraper uses."""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def text(self):
+        return "".join(self._node.itertext())
+
+    def get_attribute(self, name):
+        return self._node.get(name)
+
+    def find_elements(self, by, value):
+        if by == By.CLASS_NAME:
+            return [FakeElement(node) for node in self._node.iter()
+                    if node is not self._node and value in node.get("class", "").split()]
+        if by in (By.TAG_NAME, By.CSS_SELECTOR):
+            return [FakeElement(node) for node in self._node.iter(value)
+                    if node is not self._node]
+        raise ValueError(f"Unsupported locator: {by}")
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
+
+
+def load_html_fixture(path):
+    """Parse a well-formed HTML fixture into a FakeElement root."""
+    return FakeElement(ET.parse(path).getroot())
@@ -0,0 +1,267 @@
+"""Replay user messages through handle_message at a given arrival rate for capacity planning."""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fakes import LATENCY_DISTRIBUTIONS, FakeContext, FakeUpdate, fake_llm
+from monitoring import metrics
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+BUDGET_TEMPLATES = [
+    "пк до {price}$ для {task}",
+    "Бюджет {price} доларів, комп для {task}",
+    "хочу збірку за {price}$ {task}",
+    "{price}$ {task}",
+    "ПК для {task} до {price} $",
+]
+TASK_WORDS = {"games": ["ігор", "ігри", "gaming"], "work": ["роботи", "монтажу", "work"]}
+DECORATIONS = ["", "!", " 🙏", "!!", " 😊", "?", "  "]
+
+
+def load_corpus(path, field="text"):
+    """
+    Read user messages from a JSONL file.
+
+    Args:
+        path (str): File with one JSON object per line.
+        field (str): Key holding the message text; lines without it are skipped.
+
+    Returns:
+        list: Message strings in file order.
+    """
+    messages = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            text = json.loads(line).get(field)
+            if isinstance(text, str) and text.strip():
+                messages.append(text)
+    return messages
+
+
+def synthetic_corpus(count, distinct_budgets=40, seed=0):
+    """
+    Generate budget messages with realistic repetition.
+
+    Budgets are drawn from a small popular set and phrasing varies in case,
+    spacing, punctuation and emoji, as real users' messages do.
+    """
+    rng = random.Random(seed)
+    budgets = [500 + 100 * i for i in range(distinct_budgets)]
+    # Zipf-like popularity: a few budgets account for most messages.
+    weights = [1.0 / (rank + 1) for rank in range(distinct_budgets)]
+    rng.shuffle(budgets)
+    messages = []
+    for _ in range(count):
+        task = rng.choice(list(TASK_WORDS))
+        text = rng.choice(BUDGET_TEMPLATES).format(
+            price=rng.choices(budgets, weights)[0],
+            task=rng.choice(TASK_WORDS[task]),
+        )
+        if rng.random() < 0.3:
+            text = text.upper() if rng.random() < 0.3 else text.capitalize()
+        messages.append(text + rng.choice(DECORATIONS))
+    return messages
+
+
+def poisson_arrivals(count, rate, seed=0):
+    """Open-loop arrival offsets (seconds) with exponential inter-arrival times."""
+    rng = random.Random(seed)
+    offsets, now = [], 0.0
+    for _ in range(count):
+        now += rng.expovariate(rate)
+        offsets.append(now)
+    return offsets
+
+
+def burst_arrivals(count, rate, burst_size, seed=0):
+    """Arrival offsets where bursts of burst_size messages land at once, averaging rate/s."""
+    rng = random.Random(seed)
+    offsets, now = [], 0.0
+    while len(offsets) < count:
+        now += rng.expovariate(rate / burst_size)
+        offsets.extend([now] * min(burst_size, count - len(offsets)))
+    return offsets
+
+
+def percentiles(values):
+    """Return p50/p95/p99 of a list of seconds using nearest rank."""
+    ordered = sorted(values)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+async def replay(messages, offsets, workers, users, reply_latency):
+    """
+    Feed messages through handle_message at the given arrival offsets.
+
+    Args:
+        messages (list): Message texts.
+        offsets (list): Arrival time of each message relative to start.
+        workers (int): Concurrent handler slots, i.e. bot worker capacity.
+        users (int): Number of distinct chats messages are spread over.
+        reply_latency (float): Simulated Bot API time per reply.
+
+    Returns:
+        dict: Raw per-message samples and the wall-clock duration.
+    """
+    from bot.handlers import handle_message
+
+    slots = asyncio.Semaphore(workers)
+    contexts = {}
+    queue_delays, latencies, failures = [], [], 0
+
+    async def one(text, chat_id, arrived):
+        nonlocal failures
+        async with slots:
+            started = time.perf_counter()
+            queue_delays.append(started - arrived)
+            context = contexts.setdefault(chat_id, FakeContext())
+            try:
+                await handle_message(FakeUpdate(text, chat_id, reply_latency), context)
+            except Exception as error:
+                failures += 1
+                logger.debug(f"Handler failed for {text!r}: {error}")
+            latencies.append(time.perf_counter() - arrived)
+
+    start = time.perf_counter()
+    tasks = []
+    for index, (text, offset) in enumerate(zip(messages, offsets)):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(text, index % users, time.perf_counter())))
+    await asyncio.gather(*tasks)
+
+    return {
+        "wall": time.perf_counter() - start,
+        "queue_delays": queue_delays,
+        "latencies": latencies,
+        "failures": failures,
+    }
+
+
+def stage_report():
+    """Approximate per-stage tail latency from the stage histograms."""
+    return {
+        values[0]: {
+            "count": child.count,
+            "p50": child.quantile(0.50),
+            "p95": child.quantile(0.95),
+            "p99": child.quantile(0.99),
+        }
+        for values, child in sorted(metrics.STAGE_SECONDS.children().items())
+    }
+
+
+def main():
+    """Run a replay and print throughput, queueing delay and per-stage latency."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="JSONL file with recorded messages; synthetic if omitted")
+    parser.add_argument("--field", default="text", help="JSON key holding the message text")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=10.0, help="mean arrivals per second")
+    parser.add_argument("--arrivals", choices=["poisson", "burst"], default="poisson")
+    parser.add_argument("--burst-size", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8, help="concurrent handler slots")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--llm-dist", choices=sorted(LATENCY_DISTRIBUTIONS), default="lognormal")
+    parser.add_argument("--llm-latency", type=float, default=0.4,
+                        help="constant value, exponential mean or lognormal median (s)")
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--llm-concurrency", type=int, default=None,
+                        help="max in-flight LLM calls per NLP thread pool")
+    parser.add_argument("--no-nlp-cache", action="store_true",
+                        help="disable the extract_price_task cache to measure its effect")
+    parser.add_argument("--reply-latency", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus, args.field)
+        if not corpus:
+            parser.error(f"No '{args.field}' messages found in {args.corpus}")
+        messages = [corpus[i % len(corpus)] for i in range(args.messages)]
+    else:
+        messages = synthetic_corpus(args.messages, seed=args.seed)
+
+    if args.arrivals == "poisson":
+        offsets = poisson_arrivals(len(messages), args.rate, args.seed)
+    else:
+        offsets = burst_arrivals(len(messages), args.rate, args.burst_size, args.seed)
+
+    from nlp_integration import nlp
+    from nlp_integration.cache import ExtractionCache
+    if args.llm_concurrency:
+        nlp.EXECUTOR = ThreadPoolExecutor(max_workers=args.llm_concurrency)
+        nlp.ADVICE_WORKERS = args.llm_concurrency
+        nlp.ADVICE_EXECUTOR = ThreadPoolExecutor(max_workers=args.llm_concurrency)
+    nlp.CACHE = ExtractionCache(maxsize=0 if args.no_nlp_cache else nlp.CACHE.maxsize,
+                                ttl=nlp.CACHE.ttl)
+
+    metrics.enable()
+    metrics.REGISTRY.reset()
+    latency = LATENCY_DISTRIBUTIONS[args.llm_dist](args.llm_latency)
+    with fake_llm(latency=latency, failure_rate=args.llm_failure_rate, seed=args.seed) as client:
+        result = asyncio.run(
+            replay(messages, offsets, args.workers, args.users, args.reply_latency)
+        )
+        llm_calls = client.chat.completions.calls
+
+    report = {
+        "config": vars(args),
+        "messages": len(messages),
+        "failures": result["failures"],
+        "wall_seconds": result["wall"],
+        "throughput_per_second": len(messages) / result["wall"],
+        "offered_rate_per_second": args.rate,
+        "llm_calls": llm_calls,
+        "llm_calls_per_minute": llm_calls / result["wall"] * 60,
+        "queue_delay": percentiles(result["queue_delays"]),
+        "end_to_end": percentiles(result["latencies"]),
+        "stages": stage_report(),
+        "nlp_cache": {
+            "hits": nlp.CACHE.hits,
+            "misses": nlp.CACHE.misses,
+            "hit_rate": nlp.CACHE.hit_rate,
+            "entries": len(nlp.CACHE),
+        },
+    }
+
+    print(f"Messages: {report['messages']} ({report['failures']} failed) "
+          f"in {report['wall_seconds']:.1f}s")
+    print(f"Throughput: {report['throughput_per_second']:.2f}/s "
+          f"(offered {args.rate:.2f}/s, {args.workers} workers)")
+    print(f"LLM calls: {llm_calls} ({report['llm_calls_per_minute']:.0f}/min)")
+    cache = report["nlp_cache"]
+    print(f"NLP cache: {cache['hits']} hits / {cache['misses']} misses "
+          f"({cache['hit_rate']:.1%} hit rate, {cache['entries']} entries)")
+    for name in ("queue_delay", "end_to_end"):
+        p = report[name]
+        print(f"{name:>34}: p50 {p['p50']:.3f}s  p95 {p['p95']:.3f}s  p99 {p['p99']:.3f}s")
+    for stage, p in report["stages"].items():
+        print(f"{stage:>34}: p50 {p['p50']:.3f}s  p95 {p['p95']:.3f}s  "
+              f"p99 {p['p99']:.3f}s  (n={p['count']})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
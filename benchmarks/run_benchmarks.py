@@ -0,0 +1,442 @@
+"""Benchmark the recommendation pipeline and fail on regressions against a baseline."""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+from benchmarks.fakes import (
+    FakeBotAPI, FakeContext, FakeUpdate, constant, fake_llm, lognormal, load_html_fixture
+)
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")
+FIXTURE_PATH = os.path.join(BENCH_DIR, "fixtures", "build_partlist.html")
+# A metric regresses when it is this much slower than the baseline.
+DEFAULT_THRESHOLD = 0.25
+# Exit statuses: a regression, and a baseline that cannot be compared against.
+EXIT_REGRESSION = 1
+EXIT_NO_BASELINE = 2
+
+SAMPLE_MESSAGES = [
+    "пк до 1200$ для ігор",
+    "Бюджет 2500 доларів, потрібен комп для роботи",
+    "хочу ігровий пк за 800$",
+    "4000$ робота з відео та рендер",
+    "до 1500 для ігор",
+]
+
+
+def measure(func, number, repeat=5):
+    """
+    Time a callable.
+
+    Args:
+        func (callable): Function with no arguments.
+        number (int): Calls per repeat.
+        repeat (int): Number of repeats.
+
+    Returns:
+        float: Median seconds per call across repeats.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return statistics.median(timings)
+
+
+def percentile(values, q):
+    """Return the q-th percentile (0-100) of a list using nearest rank."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bench_prepare_scores(args):
+    """Microbenchmark input preparation for the model."""
+    from bot.recommender import prepare_scores_for_model_based_on_task
+
+    return {
+        "per_call": measure(
+            lambda: prepare_scores_for_model_based_on_task(1500.0, "games"), number=10000
+        )
+    }
+
+
+def bench_recommend_parts(args):
+    """Microbenchmark a single model recommendation."""
+    from bot.recommender import recommend_parts
+
+    return {"per_call": measure(lambda: recommend_parts(1500.0, "games"), number=200)}
+
+
+def bench_handle_message(args):
+    """Run handle_message end to end with fake Telegram updates and a fake LLM."""
+    from bot.handlers import handle_message
+
+    async def one(text, chat_id):
+        update = FakeUpdate(text, chat_id=chat_id)
+        start = time.perf_counter()
+        await handle_message(update, FakeContext())
+        return time.perf_counter() - start
+
+    async def run():
+        return await asyncio.gather(*(
+            one(SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)], i)
+            for i in range(args.messages)
+        ))
+
+    with fake_llm(latency=constant(args.llm_latency)):
+        start = time.perf_counter()
+        latencies = asyncio.run(run())
+        wall = time.perf_counter() - start
+
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "wall_per_message": wall / args.messages,
+    }
+
+
+def bench_scraper_parse(args):
+    """Parse a saved build part list with the scraper's row parser."""
+    from scraper.pcpart_scraper import parse_partlist
+
+    tbody = load_html_fixture(FIXTURE_PATH).find_element("tag name", "tbody")
+    return {"per_page": measure(lambda: parse_partlist(tbody), number=200)}
+
+
+def bench_train_epoch(args):
+    """Time one training epoch on synthetic data shaped like the real dataset."""
+    import numpy as np
+    import torch
+    import torch.nn as nn
+    from torch.utils.data import DataLoader
+
+    from bot.recommender import ENCODERS
+    from model.pcbuild_model import PCBuildModel
+    from model.train_model import BuildDataset, train_epoch
+
+    rng = np.random.default_rng(0)
+    features = rng.random((args.train_rows, 4), dtype=np.float32)
+    targets = {
+        col: rng.integers(0, len(encoder.classes_), args.train_rows)
+        for col, encoder in ENCODERS.items()
+    }
+    loader = DataLoader(BuildDataset(features, targets), batch_size=512, shuffle=True)
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model = PCBuildModel(encoders=ENCODERS).to(device)
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+    loss_fn = nn.CrossEntropyLoss()
+
+    return {
+        "per_epoch": measure(
+            lambda: train_epoch(model, loader, optimizer, loss_fn, device), number=1, repeat=3
+        )
+    }
+
+
+def bench_llm_fallback(args):
+    """
+    Call generate_recommendations against a slow, failing fake LLM.
+
+    Checks that the timeout and circuit breaker keep every call within
+    LLM_TIMEOUT plus the local generator's cost.
+    """
+    from nlp_integration import nlp
+    from nlp_integration.breaker import CircuitBreaker
+    from nlp_integration.fallback import load_component_metadata
+
+    build = {
+        "CPU": "AMD Ryzen 7 7800X3D 4.2 GHz 8-Core Processor",
+        "Motherboard": "MSI MAG B650 TOMAHAWK WIFI ATX AM5 Motherboard",
+        "Memory": "G.Skill Flare X5 32 GB (2 x 16 GB) DDR5-6000 CL30 Memory",
+        "Video Card": "Sapphire PULSE Radeon RX 7900 XT 20 GB Video Card",
+        "Power Supply": "Corsair RM850e (2023) 850 W 80+ Gold Certified Fully Modular ATX Power Supply",
+    }
+    timeout, original_timeout, original_breaker = 0.2, nlp.LLM_TIMEOUT, nlp.BREAKER
+    nlp.LLM_TIMEOUT = timeout
+    nlp.BREAKER = CircuitBreaker(failure_threshold=3, slow_call_threshold=0.15, reset_timeout=0.5)
+    load_component_metadata()
+
+    async def one():
+        start = time.perf_counter()
+        await nlp.generate_recommendations(build)
+        return time.perf_counter() - start
+
+    async def run():
+        latencies = []
+        for _ in range(args.fallback_calls):
+            latencies.append(await one())
+        return latencies
+
+    try:
+        with fake_llm(latency=lognormal(0.08, sigma=1.0), failure_rate=0.2, seed=1):
+            latencies = asyncio.run(run())
+    finally:
+        nlp.LLM_TIMEOUT, nlp.BREAKER = original_timeout, original_breaker
+
+    p99 = percentile(latencies, 99)
+    if p99 > timeout + 0.05:
+        raise AssertionError(f"Fallback p99 {p99:.3f}s exceeds the {timeout}s bound")
+    check_cancelled_probe(build)
+    stalled = check_stalled_llm(build)
+    return {"p50": percentile(latencies, 50), "p99": p99, "stalled_extract": stalled}
+
+
+def check_cancelled_probe(build):
+    """
+    A cancelled half-open probe must not leave the circuit breaker stuck, and
+    calls other than the probe must not release or close it.
+    """
+    from nlp_integration import nlp
+    from nlp_integration.breaker import CALL, CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+    original_breaker = nlp.BREAKER
+    nlp.BREAKER = breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+
+    async def run():
+        breaker.record_failure()
+        await asyncio.sleep(0.06)
+        probe = asyncio.create_task(nlp.generate_recommendations(build))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        await asyncio.wait([probe])
+        permit = breaker.allow()
+        if breaker.state != HALF_OPEN or permit is None:
+            raise AssertionError("Cancelled probe left the circuit breaker unable to recover")
+        # A call admitted while closed finishing now must not touch the probe.
+        breaker.release(CALL)
+        breaker.record_success(0.0, CALL)
+        if breaker.state != HALF_OPEN or breaker.allow() is not None:
+            raise AssertionError("A non-probe call released or closed the half-open breaker")
+        breaker.record_failure(permit)
+        breaker.record_success(0.0, CALL)
+        if breaker.state != OPEN:
+            raise AssertionError("A success arriving while open closed the breaker")
+        breaker.opened_at -= breaker.reset_timeout
+        breaker.record_success(0.0, breaker.allow())
+        if breaker.state != CLOSED:
+            raise AssertionError("A successful probe did not close the breaker")
+
+    try:
+        with fake_llm(latency=constant(0.2)):
+            asyncio.run(run())
+    finally:
+        nlp.BREAKER = original_breaker
+
+
+def check_stalled_llm(build):
+    """
+    With every advice thread hung on the LLM, extraction must still be bounded.
+
+    Returns:
+        float: Seconds extract_price_task took during the stall.
+    """
+    from nlp_integration import nlp
+    from nlp_integration.breaker import CircuitBreaker
+    from nlp_integration.cache import ExtractionCache
+
+    timeout = 0.2
+    saved = nlp.LLM_TIMEOUT, nlp.EXTRACT_TIMEOUT, nlp.BREAKER, nlp.CACHE
+    nlp.LLM_TIMEOUT = nlp.EXTRACT_TIMEOUT = timeout
+    nlp.BREAKER = CircuitBreaker(failure_threshold=1000)
+    nlp.CACHE = ExtractionCache(maxsize=0)
+
+    async def run():
+        await asyncio.gather(*(
+            nlp.generate_recommendations(build) for _ in range(2 * nlp.ADVICE_WORKERS)
+        ))
+        start = time.perf_counter()
+        await nlp.extract_price_task(SAMPLE_MESSAGES[0])
+        return time.perf_counter() - start
+
+    try:
+        with fake_llm(latency=constant(1.0)):
+            elapsed = asyncio.run(run())
+    finally:
+        nlp.LLM_TIMEOUT, nlp.EXTRACT_TIMEOUT, nlp.BREAKER, nlp.CACHE = saved
+    if elapsed > timeout + 0.05:
+        raise AssertionError(f"Extraction took {elapsed:.3f}s while the advice pool was stalled")
+    return elapsed
+
+
+def check_outbox_limits():
+    """
+    A chat under its own flood limit must be given up on after max_attempts
+    without pausing other chats, and stop() must honour its drain timeout.
+    """
+    from datetime import timedelta
+
+    from bot.outbox import OutboundSender
+
+    api = FakeBotAPI(per_chat_interval=0.0, retry_after=timedelta(seconds=0.05),
+                     flooded_chats={0})
+
+    async def run():
+        sender = OutboundSender(api, max_attempts=3)
+        sender.start()
+        for chat_id in range(10):
+            sender.enqueue(chat_id, "build")
+        await sender.stop(timeout=None)
+        if sender.dropped != 1 or sender.delivered != 9:
+            raise AssertionError("Outbox kept retrying a flooded chat past max_attempts")
+        if sender.global_bucket.paused_until:
+            raise AssertionError("A single chat's RetryAfter paused every chat")
+
+        class HangingBot:
+            async def send_message(self, **kwargs):
+                await asyncio.sleep(3600)
+
+        sender = OutboundSender(HangingBot())
+        sender.start()
+        sender.enqueue(1, "build")
+        start = time.perf_counter()
+        await sender.stop(timeout=0.1)
+        if time.perf_counter() - start > 1.0:
+            raise AssertionError("Outbox drain ignored its timeout")
+
+    asyncio.run(run())
+
+
+def bench_outbox(args):
+    """
+    Push a burst of two-part replies through OutboundSender to a rate-limiting fake API.
+
+    Reports time per delivered message and per reply, and fails if the
+    server rejected more than a few sends or any message was lost.
+    """
+    from bot.outbox import OutboundSender
+
+    check_outbox_limits()
+    api = FakeBotAPI(latency=lognormal(0.03, sigma=0.3))
+
+    async def run():
+        sender = OutboundSender(api)
+        sender.start()
+        start = time.perf_counter()
+        for i in range(args.outbox_replies):
+            chat_id = i % args.outbox_chats
+            sender.enqueue_reply(chat_id, [f"build {i}", "follow-up"])
+        await sender.stop(timeout=None)
+        return sender, time.perf_counter() - start
+
+    sender, wall = asyncio.run(run())
+    if sender.dropped or len(api.delivered) != sender.delivered:
+        raise AssertionError(f"Outbox lost messages: {sender.dropped} dropped")
+    print(f"outbox: {sender.delivered} delivered in {wall:.2f}s "
+          f"({sender.delivered / wall:.1f} msg/s), {api.rejected} rejected by the API")
+    return {
+        "per_message": wall / sender.delivered,
+        "per_reply": wall / args.outbox_replies,
+    }
+
+
+BENCHMARKS = {
+    "prepare_scores": bench_prepare_scores,
+    "recommend_parts": bench_recommend_parts,
+    "handle_message": bench_handle_message,
+    "scraper_parse": bench_scraper_parse,
+    "train_epoch": bench_train_epoch,
+    "llm_fallback": bench_llm_fallback,
+    "outbox": bench_outbox,
+}
+
+
+def find_regressions(metrics, baseline, threshold):
+    """
+    Compare metrics (seconds, lower is better) against a baseline.
+
+    Returns:
+        list: Human-readable descriptions of every regression.
+    """
+    regressions = []
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        if reference and value > reference * (1 + threshold):
+            regressions.append(
+                f"{name}: {value * 1000:.3f}ms vs baseline {reference * 1000:.3f}ms "
+                f"(+{(value / reference - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    """Run the selected benchmarks, write results and check the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.05,
+                        help="seconds the fake LLM sleeps per call")
+    parser.add_argument("--train-rows", type=int, default=20000)
+    parser.add_argument("--fallback-calls", type=int, default=200)
+    parser.add_argument("--outbox-replies", type=int, default=300)
+    parser.add_argument("--outbox-chats", type=int, default=100)
+    args = parser.parse_args()
+
+    metrics = {}
+    for name in args.only:
+        for metric, value in BENCHMARKS[name](args).items():
+            metrics[f"{name}.{metric}"] = value
+            print(f"{name}.{metric}: {value * 1000:.3f}ms")
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "llm_latency": args.llm_latency,
+            "messages": args.messages,
+        },
+        "metrics": metrics,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as file:
+                baseline = json.load(file)["metrics"]
+        baseline.update(metrics)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"meta": results["meta"], "metrics": baseline}, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        sys.exit(EXIT_NO_BASELINE)
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)["metrics"]
+    missing = sorted(name for name in metrics if name not in baseline)
+    if missing:
+        print("Metrics missing from the baseline (run with --update-baseline):\n  "
+              + "\n  ".join(missing))
+        sys.exit(EXIT_NO_BASELINE)
+    regressions = find_regressions(metrics, baseline, args.threshold)
+    if regressions:
+        print("Performance regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(EXIT_REGRESSION)
+    print(f"No regressions beyond {args.threshold:.0%} of baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,10 @@ from telegram.ext import ContextTypes
 
 from .keyboards import start_keyboard
 from .recommender import recommend_parts
+from .speculation import start_speculation
 from nlp_integration.nlp import extract_price_task, generate_recommendations
+from monitoring.metrics import timer
+from monitoring.profiler import profile_handler
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -17,8 +20,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         context (ContextTypes.DEFAULT_TYPE): Context object with user data.
     """
     context.user_data["active"] = False
-    await update.message.reply_text(
-        "Привіт! Натисни '🚀 Почати', щоб розпочати підбір конфігурації.",
+    await reply(
+        update, context, "Привіт! Натисни '🚀 Почати', щоб розпочати підбір конфігурації.",
         reply_markup=start_keyboard
     )
 
@@ -51,6 +54,26 @@ async def stop_build(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     await update.callback_query.edit_message_text("🛑 Підбір вимкнено.")
 
 
+async def reply(update: Update, context: ContextTypes.DEFAULT_TYPE, *parts, reply_markup=None):
+    """
+    Answer in the chat through the outbox, or inline when none is running.
+
+    Args:
+        update (Update): Telegram update being answered.
+        context (ContextTypes.DEFAULT_TYPE): Context whose bot_data may hold the outbox.
+        *parts (str): Message texts in order; the outbox merges them when they fit.
+        reply_markup: Keyboard attached to the last message.
+    """
+    outbox = context.bot_data.get("outbox")
+    if outbox is not None:
+        outbox.enqueue_reply(update.effective_chat.id, list(parts), reply_markup=reply_markup)
+        return
+    for index, text in enumerate(parts):
+        markup = reply_markup if index == len(parts) - 1 else None
+        await update.message.reply_text(text, reply_markup=markup)
+
+
+@profile_handler
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle user text input and generate PC configuration.
@@ -63,31 +86,42 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     if user_text == "🚀 почати":
         context.user_data["active"] = True
-        await update.message.reply_text(
-            "👷 Напиши свій бюджет($) і тип задач (ігри чи робота)."
-        )
+        await reply(update, context, "👷 Напиши свій бюджет($) і тип задач (ігри чи робота).")
         return
 
     if user_text == "🛑 зупинити":
         context.user_data["active"] = False
-        await update.message.reply_text(
-            "🛑 Підбір завершено. Натисни '🚀 Почати', щоб розпочати знову."
+        await reply(
+            update, context, "🛑 Підбір завершено. Натисни '🚀 Почати', щоб розпочати знову."
         )
         return
 
     if not context.user_data.get("active", False):
-        await update.message.reply_text("⚠️ Натисни '🚀 Почати', щоб розпочати.")
+        await reply(update, context, "⚠️ Натисни '🚀 Почати', щоб розпочати.")
         return
 
-    data = await extract_price_task(user_text)
+    speculation = start_speculation(user_text)
+    try:
+        with timer("extract_price_task"):
+            data = await extract_price_task(user_text)
+        speculative = await speculation.resolve(data) if speculation and data else None
+    finally:
+        if speculation:
+            await speculation.cancel()
+
     if not data:
-        await update.message.reply_text(
-            "⚠️ Не вдалося зрозуміти запит. Наприклад: 'ПК до 1200$ для ігор'."
+        await reply(
+            update, context, "⚠️ Не вдалося зрозуміти запит. Наприклад: 'ПК до 1200$ для ігор'."
         )
         return
 
-    build = recommend_parts(data["price"], data["task"])
-    recommendations = await generate_recommendations(build)
+    if speculative:
+        build, recommendations = speculative
+    else:
+        with timer("recommend_parts"):
+            build = recommend_parts(data["price"], data["task"])
+        with timer("generate_recommendations"):
+            recommendations = await generate_recommendations(build)
 
     response_text = (
         "Ось твоя рекомендована збірка за запитом:\n"
@@ -96,8 +130,6 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         + recommendations
     )
 
-    await update.message.reply_text(response_text)
-    await update.message.reply_text(
-        "🔁 Хочеш зібрати ще одну конфігурацію? Просто напиши новий запит або натисни '🛑 Зупинити'.",
-        reply_markup=start_keyboard
-    )
+    follow_up = "🔁 Хочеш зібрати ще одну конфігурацію? Просто напиши новий запит або натисни '🛑 Зупинити'."
+    with timer("telegram_reply"):
+        await reply(update, context, response_text, follow_up, reply_markup=start_keyboard)
@@ -4,7 +4,12 @@ from telegram.ext import (
 )
 from config.settings import TELEGRAM_TOKEN
 from bot.handlers import start, start_build, stop_build, handle_message
+from bot.outbox import OutboundSender
+from monitoring import metrics, profiler
+from nlp_integration.fallback import load_component_metadata
+import atexit
 import logging
+import os
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,9 +17,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def start_monitoring():
+    """Expose metrics and register the profile dump when enabled via env."""
+    if metrics.ENABLED:
+        port = os.getenv("PCBOT_METRICS_PORT")
+        if port:
+            metrics.start_http_server(int(port), os.getenv("PCBOT_METRICS_HOST", "127.0.0.1"))
+        interval = os.getenv("PCBOT_METRICS_DUMP_INTERVAL")
+        if interval:
+            metrics.start_periodic_dump(float(interval), os.getenv("PCBOT_METRICS_DUMP_PATH"))
+    if profiler.ENABLED:
+        atexit.register(profiler.PROFILER.dump)
+
+
+async def start_outbox(app):
+    """Deliver replies through the rate-limited outbox unless PCBOT_OUTBOX=0."""
+    if os.getenv("PCBOT_OUTBOX", "1") == "0":
+        return
+    outbox = OutboundSender(app.bot)
+    outbox.start()
+    app.bot_data["outbox"] = outbox
+
+
+async def stop_outbox(app):
+    """Flush queued replies while app.bot is still initialised (runs as post_stop)."""
+    outbox = app.bot_data.pop("outbox", None)
+    if outbox is not None:
+        await outbox.stop()
+
+
 def main():
     """Start the bot."""
-    app = ApplicationBuilder().token(TELEGRAM_TOKEN).build()
+    start_monitoring()
+    # Build fallback advice metadata now rather than on the first LLM outage.
+    load_component_metadata()
+    app = (
+        ApplicationBuilder()
+        .token(TELEGRAM_TOKEN)
+        .post_init(start_outbox)
+        .post_stop(stop_outbox)
+        .build()
+    )
 
     app.add_handler(CommandHandler("start", start))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
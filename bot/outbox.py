@@ -0,0 +1,291 @@
+"""Rate-limited asynchronous delivery of outgoing Telegram messages."""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from telegram.constants import MessageLimit
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
+
+from monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows roughly 30 messages/s overall and 1 message/s per chat.
+GLOBAL_RATE = 30.0
+# Pace global sends evenly instead of bursting a whole second's quota at once.
+GLOBAL_BURST = 1
+PER_CHAT_RATE = 1.0
+PER_CHAT_BURST = 1
+MAX_ATTEMPTS = 5
+# A RetryAfter longer than this drops the message instead of stalling its chat.
+MAX_RETRY_AFTER = 60.0
+# RetryAfter from this many distinct chats within FLOOD_WINDOW seconds is treated
+# as a bot-wide limit and pauses every chat; otherwise only the chat is paused.
+GLOBAL_FLOOD_CHATS = 3
+FLOOD_WINDOW = 5.0
+WORKERS = 8
+# Seconds stop() waits for queued messages before giving up on them.
+DRAIN_TIMEOUT = float(os.getenv("PCBOT_OUTBOX_DRAIN_TIMEOUT", "10"))
+# Idle per-chat buckets are pruned once this many are tracked.
+MAX_TRACKED_CHATS = 10000
+
+
+class TokenBucket:
+    """Token bucket that can also be paused for a server-imposed wait."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self):
+        """Seconds until a token is available (0 if one is available now)."""
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(0.0, self.paused_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def consume(self):
+        """Take one token; call only after delay() returned 0."""
+        self.tokens -= 1
+
+    def pause(self, seconds):
+        """Hand out no tokens for the given number of seconds."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        self.paused_until = max(self.paused_until, now + seconds)
+
+
+@dataclass
+class OutboundMessage:
+    """A message waiting for delivery."""
+
+    chat_id: int
+    text: str
+    reply_markup: object = None
+    enqueued: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+def merge_parts(parts, limit=MessageLimit.MAX_TEXT_LENGTH):
+    """
+    Join consecutive text parts into as few messages as fit the length limit.
+
+    Args:
+        parts (list): Message texts in display order.
+        limit (int): Maximum characters per message.
+
+    Returns:
+        list: Merged texts, each at most limit characters unless a single
+        part is already longer.
+    """
+    merged = []
+    for part in parts:
+        if merged and len(merged[-1]) + 2 + len(part) <= limit:
+            merged[-1] = f"{merged[-1]}\n\n{part}"
+        else:
+            merged.append(part)
+    return merged
+
+
+def _retry_after_seconds(error):
+    """RetryAfter.retry_after is an int or a timedelta depending on the PTB version."""
+    value = error.retry_after
+    return value.total_seconds() if hasattr(value, "total_seconds") else float(value)
+
+
+class OutboundSender:
+    """
+    Deliver messages in the background under global and per-chat rate limits.
+
+    Messages for one chat are sent in order by one worker at a time.
+    RetryAfter responses pause the chat for the requested time, and the
+    message is retried; the global bucket is paused too once several chats
+    hit RetryAfter at about the same time. Every attempt, including those
+    answered with RetryAfter, counts toward max_attempts. A timed out send
+    is not retried, since Telegram may already have delivered it.
+    """
+
+    def __init__(self, bot, global_rate=GLOBAL_RATE, global_burst=GLOBAL_BURST,
+                 per_chat_rate=PER_CHAT_RATE, per_chat_burst=PER_CHAT_BURST, workers=WORKERS,
+                 max_attempts=MAX_ATTEMPTS):
+        """
+        Initialize the sender.
+
+        Args:
+            bot: Object with an async send_message(chat_id, text, reply_markup=...).
+            global_rate (float): Messages per second across all chats.
+            global_burst (int): Messages that may go out back to back across all chats.
+            per_chat_rate (float): Messages per second to a single chat.
+            per_chat_burst (int): Messages a chat may receive back to back.
+            workers (int): Concurrent deliveries.
+            max_attempts (int): Attempts per message on RetryAfter and network errors.
+        """
+        self.bot = bot
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.delivered = 0
+        self.retried = 0
+        self.dropped = 0
+        self._flood_events = deque()
+        self._chat_buckets = {}
+        self._pending = {}
+        self._ready = asyncio.Queue()
+        self._tasks = []
+
+    def enqueue(self, chat_id, text, reply_markup=None):
+        """Queue a message for delivery and return immediately."""
+        queue = self._pending.get(chat_id)
+        if queue is None:
+            if len(self._chat_buckets) > MAX_TRACKED_CHATS:
+                self._prune_buckets()
+            queue = self._pending[chat_id] = deque()
+            self._ready.put_nowait(chat_id)
+        queue.append(OutboundMessage(chat_id, text, reply_markup))
+
+    def enqueue_reply(self, chat_id, parts, reply_markup=None):
+        """Queue text parts merged into as few messages as possible; markup goes on the last."""
+        merged = merge_parts(parts)
+        for index, text in enumerate(merged):
+            self.enqueue(chat_id, text, reply_markup if index == len(merged) - 1 else None)
+
+    def start(self):
+        """Start the delivery workers on the running event loop."""
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def join(self):
+        """Wait until every queued message has been delivered or dropped."""
+        await self._ready.join()
+
+    async def stop(self, drain=True, timeout=DRAIN_TIMEOUT):
+        """
+        Stop the workers, optionally delivering what is queued first.
+
+        Args:
+            drain (bool): Wait for queued messages before stopping.
+            timeout (float | None): Longest wait for the drain; None waits forever.
+        """
+        if drain:
+            try:
+                await asyncio.wait_for(self.join(), timeout)
+            except asyncio.TimeoutError:
+                undelivered = sum(len(queue) for queue in self._pending.values())
+                logger.warning(f"Outbox drain timed out after {timeout}s; "
+                               f"{undelivered} messages not delivered")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _prune_buckets(self):
+        """Forget buckets of idle chats that have refilled completely."""
+        for chat_id, bucket in list(self._chat_buckets.items()):
+            if chat_id not in self._pending and bucket.delay() == 0 \
+                    and bucket.tokens >= bucket.capacity:
+                del self._chat_buckets[chat_id]
+
+    def _chat_bucket(self, chat_id):
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(
+                self.per_chat_rate, self.per_chat_burst
+            )
+        return bucket
+
+    def _is_global_flood(self, chat_id):
+        """Record a RetryAfter for chat_id and tell whether it looks bot-wide."""
+        now = time.monotonic()
+        self._flood_events.append((now, chat_id))
+        while self._flood_events[0][0] < now - FLOOD_WINDOW:
+            self._flood_events.popleft()
+        return len({chat for _, chat in self._flood_events}) >= GLOBAL_FLOOD_CHATS
+
+    def _drop(self, chat_id, reason, result="dropped"):
+        logger.error(f"Dropping message to chat {chat_id}: {reason}")
+        self.dropped += 1
+        metrics.count(metrics.OUTBOX_MESSAGES, result)
+
+    async def _acquire(self, chat_bucket):
+        """Wait until both the chat and the global bucket have a token, then take them."""
+        while True:
+            wait = max(chat_bucket.delay(), self.global_bucket.delay())
+            if wait <= 0:
+                chat_bucket.consume()
+                self.global_bucket.consume()
+                return
+            await asyncio.sleep(wait)
+
+    async def _worker(self):
+        while True:
+            chat_id = await self._ready.get()
+            try:
+                await self._deliver_next(chat_id)
+            finally:
+                if self._pending.get(chat_id):
+                    self._ready.put_nowait(chat_id)
+                else:
+                    self._pending.pop(chat_id, None)
+                self._ready.task_done()
+
+    async def _deliver_next(self, chat_id):
+        """Try to send the oldest pending message of a chat once."""
+        queue = self._pending[chat_id]
+        message = queue[0]
+        chat_bucket = self._chat_bucket(chat_id)
+        await self._acquire(chat_bucket)
+        message.attempts += 1
+        try:
+            await self.bot.send_message(
+                chat_id=chat_id, text=message.text, reply_markup=message.reply_markup
+            )
+        except RetryAfter as error:
+            seconds = _retry_after_seconds(error)
+            if message.attempts >= self.max_attempts or seconds > MAX_RETRY_AFTER:
+                self._drop(chat_id, f"flood control asked to wait {seconds}s "
+                                    f"after {message.attempts} attempts")
+            else:
+                logger.warning(f"Flood control for chat {chat_id}: retry in {seconds}s")
+                chat_bucket.pause(seconds)
+                if self._is_global_flood(chat_id):
+                    self.global_bucket.pause(seconds)
+                self.retried += 1
+                metrics.count(metrics.OUTBOX_MESSAGES, "retry_after")
+                return
+        except TimedOut as error:
+            # The request may have reached Telegram; retrying could send it twice.
+            self._drop(chat_id, f"send timed out and may have been delivered ({error})",
+                       "timed_out")
+        except NetworkError as error:
+            # BadRequest subclasses NetworkError but retrying it cannot succeed.
+            if message.attempts < self.max_attempts and not isinstance(error, BadRequest):
+                chat_bucket.pause(min(2 ** message.attempts, 30))
+                self.retried += 1
+                metrics.count(metrics.OUTBOX_MESSAGES, "retry")
+                return
+            self._drop(chat_id, error)
+        except Exception as error:
+            self._drop(chat_id, error)
+        else:
+            self.delivered += 1
+            metrics.count(metrics.OUTBOX_MESSAGES, "delivered")
+            if metrics.ENABLED:
+                metrics.STAGE_SECONDS.observe(
+                    time.monotonic() - message.enqueued, "outbox_delivery"
+                )
+        queue.popleft()
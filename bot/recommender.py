@@ -4,6 +4,7 @@ import torch
 import pickle
 from model.pcbuild_model import PCBuildModel
 from config.settings import MODEL_PATH, ENCODERS_PATH, DATASET_PATH
+from monitoring.metrics import timer
 import logging
 import pandas as pd
 
@@ -43,20 +44,23 @@ def recommend_parts(price: float, task: str) -> dict:
     [price, game_score, work_score, is_top_segment] = (
         prepare_scores_for_model_based_on_task(price, task).values()
     )
-    input_tensor = torch.tensor(
-        [[price, game_score, work_score, is_top_segment]], dtype=torch.float32
-    ).to(DEVICE)
+    with timer("recommend_parts.tensor"):
+        input_tensor = torch.tensor(
+            [[price, game_score, work_score, is_top_segment]], dtype=torch.float32
+        ).to(DEVICE)
 
     with torch.no_grad():
-        outputs = MODEL(input_tensor)
-        predictions = {
-            key: torch.argmax(value, dim=1).item()
-            for key, value in outputs.items()
-        }
-        readable = {
-            key: ENCODERS[key].inverse_transform([predictions[key]])[0]
-            for key in predictions
-        }
+        with timer("recommend_parts.forward"):
+            outputs = MODEL(input_tensor)
+            predictions = {
+                key: torch.argmax(value, dim=1).item()
+                for key, value in outputs.items()
+            }
+        with timer("recommend_parts.inverse_transform"):
+            readable = {
+                key: ENCODERS[key].inverse_transform([predictions[key]])[0]
+                for key in predictions
+            }
         logger.info(f"Readable model's recommendations: {readable}")
     return readable
 
@@ -0,0 +1,154 @@
+"""Speculative recommendations started before the NLP extraction confirms the request."""
+
+import asyncio
+import logging
+import os
+import re
+import time
+
+from .recommender import recommend_parts
+from nlp_integration.nlp import generate_recommendations
+from monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+# On by default. Each speculation that is not used (wrong guess, failed
+# extraction) still spends one generate_recommendations LLM call: cancelling
+# the task cannot stop the request already running in the executor thread.
+# In the worst case that doubles advice calls per guessed message; the actual
+# waste is counted in pcbot_speculation_wasted_advice_calls_total.
+ENABLED = os.getenv("PCBOT_SPECULATION", "1") == "1"
+
+NUMBER_PATTERN = re.compile(r"(?<![\w.,])(\d+(?:[.,]\d+)?)(?:\s*(k|к|тис\w*)(?![^\W\d_]))?")
+GAMES_PATTERN = re.compile(r"ігор|ігр|гри|гра|гейм|gam")
+WORK_PATTERN = re.compile(r"робот|work|монтаж|рендер|програм|дизайн")
+
+
+def guess_price_task(text: str):
+    """
+    Guess budget and task from a message without calling the LLM.
+
+    Only unambiguous messages are guessed: exactly one number and keywords
+    of exactly one task type.
+
+    Args:
+        text (str): Lowercased user message.
+
+    Returns:
+        dict | None: {"price": float, "task": str} or None if unsure.
+    """
+    numbers = NUMBER_PATTERN.findall(text)
+    if len(numbers) != 1:
+        return None
+    games = bool(GAMES_PATTERN.search(text))
+    work = bool(WORK_PATTERN.search(text))
+    if games == work:
+        return None
+
+    value, multiplier = numbers[0]
+    price = float(value.replace(",", "."))
+    if multiplier:
+        price *= 1000
+    return {"price": price, "task": "games" if games else "work"}
+
+
+def guess_matches(guess: dict, data: dict) -> bool:
+    """Check whether the LLM extraction confirms a guess."""
+    try:
+        price = float(data.get("price"))
+    except (TypeError, ValueError):
+        return False
+    return data.get("task") == guess["task"] and abs(price - guess["price"]) < 0.01
+
+
+class Speculation:
+    """A recommendation computed from a guess while the LLM extraction runs."""
+
+    def __init__(self, guess: dict):
+        self.guess = guess
+        self.started = time.perf_counter()
+        self.finished = None
+        self.advice_started = False
+        self.used = False
+        self.cancelled = False
+        self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        with metrics.timer("speculation"):
+            build = recommend_parts(self.guess["price"], self.guess["task"])
+            self.advice_started = True
+            recommendations = await generate_recommendations(build)
+        self.finished = time.perf_counter()
+        return build, recommendations
+
+    async def resolve(self, data: dict):
+        """
+        Use the speculative result if the extraction confirms the guess.
+
+        Args:
+            data (dict): Authoritative {"price", "task"} from the LLM.
+
+        Returns:
+            tuple | None: (build, recommendations), or None when the guess
+            was wrong or the speculative run failed.
+        """
+        if not guess_matches(self.guess, data):
+            metrics.count(metrics.SPECULATIONS, "miss")
+            await self.cancel()
+            return None
+
+        self.used = True
+        confirmed = time.perf_counter()
+        try:
+            build, recommendations = await self.task
+        except Exception as error:
+            metrics.count(metrics.SPECULATIONS, "error")
+            logger.warning(f"Speculative recommendation failed: {error}")
+            return None
+
+        metrics.count(metrics.SPECULATIONS, "hit")
+        if metrics.ENABLED:
+            # Without speculation the whole run would have started at confirmation.
+            duration = self.finished - self.started
+            saved = confirmed + duration - max(confirmed, self.finished)
+            metrics.SPECULATION_SAVED_SECONDS.observe(saved)
+        return build, recommendations
+
+    async def cancel(self):
+        """
+        Cancel the speculative run and wait until it has unwound.
+
+        An advice call that had already been submitted keeps running in its
+        executor thread, so an unused run is counted as a wasted call.
+        """
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if not self.used and self.advice_started:
+            metrics.count(metrics.SPECULATION_WASTED_CALLS)
+        self.task.cancel()
+        # asyncio.wait never raises the task's error or cancellation, so a
+        # cancellation of the handler itself still propagates from here.
+        await asyncio.wait([self.task])
+        if not self.task.cancelled():
+            # Retrieve the outcome so a failed run does not log "never retrieved".
+            self.task.exception()
+
+
+def start_speculation(text: str):
+    """
+    Start a speculative recommendation if the message can be guessed.
+
+    Args:
+        text (str): Lowercased user message.
+
+    Returns:
+        Speculation | None: Running speculation, or None.
+    """
+    if not ENABLED:
+        return None
+    guess = guess_price_task(text)
+    if guess is None:
+        metrics.count(metrics.SPECULATIONS, "skipped")
+        return None
+    return Speculation(guess)
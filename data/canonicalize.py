@@ -0,0 +1,295 @@
+"""Cluster near-duplicate component names and emit a raw -> canonical mapping table."""
+
+import argparse
+import logging
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import combinations
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MAPPING_PATH = "data/canonical_names.csv"
+COMPONENT_COLUMNS = ["CPU", "Motherboard", "Memory", "Video Card", "Power Supply"]
+SIMILARITY_THRESHOLD = 0.8
+
+# Tokens that never distinguish two parts of the same column.
+COMMON_NOISE = {
+    "oc", "edition", "black", "white", "rgb", "argb", "the", "with", "and", "version",
+}
+COLUMN_NOISE = {
+    "CPU": {"processor", "oem", "tray", "box", "boxed"},
+    "Motherboard": {"motherboard"},
+    "Memory": {"memory", "desktop"},
+    # Board partners and their product lines: variants of one GPU share a class.
+    "Video Card": {
+        "video", "card", "graphics", "gaming", "asus", "msi", "gigabyte", "zotac",
+        "sapphire", "xfx", "powercolor", "pny", "evga", "palit", "gainward", "asrock",
+        "inno3d", "galax", "colorful", "acer", "intel", "nvidia", "amd", "founders",
+        "geforce", "radeon", "tuf", "rog", "strix", "prime", "dual", "ventus", "suprim", "trio",
+        "windforce", "eagle", "aero", "aorus", "master", "elite", "pulse", "nitro",
+        "pure", "hellhound", "red", "devil", "fighter", "swift", "merc", "qick",
+        "speedster", "twin", "edge", "trinity", "amp", "airboost", "phantom",
+        "challenger", "steel", "legend", "x", "2x", "3x", "plus", "mini", "x2", "x3",
+        "verto", "epic", "ultra", "ftw3", "xc", "xc3", "sc", "jetstream", "gamerock",
+        "infinity", "expert", "shadow", "mech", "stealth", "vision", "lp", "low", "profile",
+        # Memory type follows from the GPU model and is not always in the title.
+        "gddr5", "gddr6", "gddr6x", "gddr7",
+    },
+    "Power Supply": {"power", "supply", "certified"},
+}
+# Suffixes that change the product even though they carry no digits.
+DISCRIMINATORS = {"ti", "super", "xt", "xtx", "gre", "pro", "max", "wifi", "ddr4", "ddr5"}
+SERIES_PREFIX_PATTERN = re.compile(r"\b(rtx|gtx|rx|arc)(\d)")
+# Video card tokens directly before a GPU model number ("rx 7900", "arc a770").
+GPU_SERIES = {"rtx", "gtx", "gt", "rx", "arc", "hd"}
+MEMORY_SIZE_PATTERN = re.compile(r"\d+gb")
+PURE_NUMBER_PATTERN = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+
+def normalize_name(name, column):
+    """
+    Lowercase a product title and drop tokens that do not identify the part.
+
+    Args:
+        name (str): Raw product title from the scraper.
+        column (str): Dataset column the title belongs to.
+
+    Returns:
+        list: Remaining tokens in their original order.
+    """
+    text = unicodedata.normalize("NFKC", str(name)).lower()
+    text = SERIES_PREFIX_PATTERN.sub(r"\1 \2", text)
+    noise = COMMON_NOISE | COLUMN_NOISE.get(column, set())
+    tokens = [token for token in TOKEN_PATTERN.findall(text) if token not in noise]
+    if column == "Video Card":
+        tokens = _drop_product_line_numbers(tokens)
+    return tokens
+
+
+def _drop_product_line_numbers(tokens):
+    """
+    Drop a video card's bare numbers unless they are its model number or memory size.
+
+    Partner product lines carry their own numbers ("MERC 310", "QICK 319")
+    that would otherwise split one GPU into several blocking keys. Tokens
+    mixing letters and digits ("w7900", "a770", "p2200") are always model
+    numbers and are kept.
+    """
+    kept = []
+    for index, token in enumerate(tokens):
+        if PURE_NUMBER_PATTERN.fullmatch(token):
+            previous = tokens[index - 1] if index else ""
+            following = tokens[index + 1] if index + 1 < len(tokens) else ""
+            if not (previous in GPU_SERIES or following == "gb"
+                    or MEMORY_SIZE_PATTERN.fullmatch(token)):
+                continue
+        kept.append(token)
+    return kept
+
+
+def blocking_key(tokens):
+    """Tokens that must be identical for two names to be compared at all."""
+    return tuple(sorted({t for t in tokens if any(c.isdigit() for c in t) or t in DISCRIMINATORS}))
+
+
+def trigrams(tokens):
+    """Character trigrams of the space-joined tokens."""
+    text = f" {' '.join(tokens)} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def jaccard(left, right):
+    """Jaccard similarity of two sets."""
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def cluster_names(counts, column, threshold=SIMILARITY_THRESHOLD):
+    """
+    Group near-duplicate names of one column.
+
+    Names are only compared within the same blocking key, so the cost is
+    quadratic in block size rather than in the number of distinct names.
+
+    Args:
+        counts (Counter): Raw name -> number of rows.
+        column (str): Dataset column the names belong to.
+        threshold (float): Minimum trigram Jaccard similarity to merge.
+
+    Returns:
+        dict: Raw name -> canonical name (the most frequent name in its cluster).
+    """
+    normalized = {name: normalize_name(name, column) for name in counts}
+    blocks = defaultdict(list)
+    for name, tokens in normalized.items():
+        blocks[blocking_key(tokens)].append(name)
+
+    parent = {name: name for name in counts}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for names in blocks.values():
+        # Identical normalised text merges without a similarity check.
+        by_text = {}
+        for name in names:
+            text = " ".join(normalized[name])
+            if text in by_text:
+                parent[find(name)] = find(by_text[text])
+            else:
+                by_text[text] = name
+        representatives = list(by_text.values())
+        grams = {name: trigrams(normalized[name]) for name in representatives}
+        for left, right in combinations(representatives, 2):
+            if jaccard(grams[left], grams[right]) >= threshold:
+                parent[find(left)] = find(right)
+
+    clusters = defaultdict(list)
+    for name in counts:
+        clusters[find(name)].append(name)
+
+    mapping = {}
+    for members in clusters.values():
+        canonical = max(members, key=lambda n: (counts[n], -len(n), n))
+        for name in members:
+            mapping[name] = canonical
+    return mapping
+
+
+def build_mapping(df, columns=COMPONENT_COLUMNS, threshold=SIMILARITY_THRESHOLD):
+    """
+    Build the mapping table for every component column.
+
+    Returns:
+        pd.DataFrame: Columns "column", "raw", "canonical".
+    """
+    rows = []
+    for column in columns:
+        counts = Counter(df[column].dropna().astype(str))
+        mapping = cluster_names(counts, column, threshold)
+        rows.extend((column, raw, canonical) for raw, canonical in sorted(mapping.items()))
+    return pd.DataFrame(rows, columns=["column", "raw", "canonical"])
+
+
+def load_mapping(path=MAPPING_PATH):
+    """
+    Read a mapping table written by this module.
+
+    Returns:
+        dict: column -> {raw name: canonical name}; empty if the file is missing.
+    """
+    try:
+        table = pd.read_csv(path)
+    except FileNotFoundError:
+        return {}
+    mapping = defaultdict(dict)
+    for column, raw, canonical in table[["column", "raw", "canonical"]].itertuples(index=False):
+        mapping[column][raw] = canonical
+    return dict(mapping)
+
+
+def apply_mapping(df, mapping):
+    """
+    Replace raw component names with canonical ones.
+
+    Args:
+        df (pd.DataFrame): Build data.
+        mapping (dict): Output of load_mapping.
+
+    Returns:
+        pd.DataFrame: Copy of df with canonical names; unknown names are kept.
+    """
+    df = df.copy()
+    for column, names in mapping.items():
+        if column in df.columns:
+            df[column] = df[column].map(names).fillna(df[column])
+    return df
+
+
+def _model_for(class_counts):
+    """PCBuildModel whose output heads have the given number of classes."""
+    from types import SimpleNamespace
+
+    from model.pcbuild_model import PCBuildModel
+
+    encoders = {col: SimpleNamespace(classes_=range(count)) for col, count in class_counts.items()}
+    return PCBuildModel(encoders=encoders)
+
+
+def head_size(class_counts):
+    """Parameter count and float32 bytes of the output heads for given class counts."""
+    heads = _model_for(class_counts).output_heads
+    params = sum(parameter.numel() for parameter in heads.parameters())
+    return params, params * 4
+
+
+def inference_latency(class_counts, runs=2000):
+    """Mean seconds per single-row forward pass of PCBuildModel with these head widths."""
+    import torch
+
+    model = _model_for(class_counts).eval()
+    inputs = torch.rand(1, 4)
+    with torch.no_grad():
+        for _ in range(100):
+            model(inputs)
+        start = time.perf_counter()
+        for _ in range(runs):
+            outputs = model(inputs)
+            for value in outputs.values():
+                torch.argmax(value, dim=1).item()
+    return (time.perf_counter() - start) / runs
+
+
+def report(df, canonical_df, columns=COMPONENT_COLUMNS, measure_latency=True):
+    """Print class counts, head size and inference latency before and after."""
+    before = {col: df[col].nunique() for col in columns}
+    after = {col: canonical_df[col].nunique() for col in columns}
+    print(f"{'column':<14}{'before':>8}{'after':>8}{'reduction':>11}")
+    for col in columns:
+        reduction = 1 - after[col] / before[col] if before[col] else 0.0
+        print(f"{col:<14}{before[col]:>8}{after[col]:>8}{reduction:>10.1%}")
+
+    for label, counts in (("before", before), ("after", after)):
+        params, size = head_size(counts)
+        line = f"Output heads {label}: {params} params, {size / 1024:.1f} KiB"
+        if measure_latency:
+            line += f", {inference_latency(counts) * 1e6:.1f} us per recommendation"
+        print(line)
+
+
+def main():
+    """Canonicalise a scraped dataset and write the mapping table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", help="CSV written by save_to_csv")
+    parser.add_argument("--output", help="write the canonicalised dataset here")
+    parser.add_argument("--mapping", default=MAPPING_PATH)
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    parser.add_argument("--no-latency", action="store_true",
+                        help="skip the inference latency measurement")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    df = pd.read_csv(args.input)
+    columns = [col for col in COMPONENT_COLUMNS if col in df.columns]
+    start = time.perf_counter()
+    table = build_mapping(df, columns, args.threshold)
+    logger.info(f"Clustered {len(table)} names in {time.perf_counter() - start:.2f}s")
+    table.to_csv(args.mapping, index=False)
+
+    canonical_df = apply_mapping(df, load_mapping(args.mapping))
+    if args.output:
+        canonical_df.to_csv(args.output, index=False)
+    report(df, canonical_df, columns, measure_latency=not args.no_latency)
+
+
+if __name__ == "__main__":
+    main()
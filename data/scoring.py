@@ -0,0 +1,332 @@
+"""Compute Game and Work Scores for scraped builds from local benchmark tables."""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.canonicalize import GPU_SERIES, MEMORY_SIZE_PATTERN, normalize_name
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS_DIR = "data/benchmarks"
+# Each table is a CSV with columns: name, game, work (relative performance points).
+BENCHMARK_TABLES = {"CPU": "cpu.csv", "Video Card": "gpu.csv"}
+KEY_COLUMNS = ["CPU", "Motherboard", "Memory", "Video Card", "Power Supply", "Total Price"]
+
+# Share of each component in the final scores.
+GAME_WEIGHTS = {"CPU": 0.3, "Video Card": 0.7}
+WORK_WEIGHTS = {"CPU": 0.6, "Video Card": 0.4}
+# Builds without a video card use integrated graphics: scored from a gpu.csv row
+# with this name if present, otherwise the GPU contributes nothing.
+INTEGRATED_GPU_NAME = "Integrated Graphics"
+# Extra Work Score points for 64 GB of RAM or more, scaled linearly below that.
+MEMORY_WORK_BONUS = 10.0
+MEMORY_FULL_BONUS_GB = 64
+# Suffixes that tell two GPUs with the same model number apart.
+GPU_DISCRIMINATORS = {"ti", "super", "xt", "xtx", "gre"}
+UNIT_SUFFIXES = ("gb", "ghz", "mhz", "w")
+
+
+def load_benchmarks(directory=BENCHMARKS_DIR):
+    """
+    Read the per-component benchmark tables.
+
+    Returns:
+        dict: Column name -> DataFrame with name, game and work columns.
+    """
+    tables = {}
+    for column, filename in BENCHMARK_TABLES.items():
+        path = os.path.join(directory, filename)
+        tables[column] = pd.read_csv(path, usecols=["name", "game", "work"])
+        logger.info(f"Loaded {len(tables[column])} {column} benchmarks from {path}")
+    return tables
+
+
+def model_key(tokens, column):
+    """
+    Tokens that identify the part's model, ignoring clocks, core counts and memory.
+
+    For CPUs this is the SKU token ("7800x3d", "14700k", "7600"): the first token
+    with at least three digits that is not a decimal or a unit. For video cards it
+    is the series, model number and suffixes ("rx 7900 xt"), without the memory
+    size. Other columns have no model key.
+
+    Args:
+        tokens (list): Output of normalize_name.
+        column (str): Dataset column the tokens belong to.
+
+    Returns:
+        tuple: Model key, empty when the name carries no model number.
+    """
+    if column == "CPU":
+        for token in tokens:
+            if ("." not in token and not token.endswith(UNIT_SUFFIXES)
+                    and sum(c.isdigit() for c in token) >= 3):
+                return (token,)
+        return ()
+    if column == "Video Card":
+        key = set()
+        for index, token in enumerate(tokens):
+            following = tokens[index + 1] if index + 1 < len(tokens) else ""
+            if token in GPU_SERIES or token in GPU_DISCRIMINATORS:
+                key.add(token)
+            elif (any(c.isdigit() for c in token) and following != "gb"
+                    and not MEMORY_SIZE_PATTERN.fullmatch(token)):
+                key.add(token)
+        if not any(any(c.isdigit() for c in token) for token in key):
+            return ()
+        return tuple(sorted(key))
+    return ()
+
+
+def _lookup_index(table, column):
+    """
+    Index benchmark rows by normalised text, and by model key where unambiguous.
+
+    Returns:
+        tuple: (text -> row position, model key -> row position)
+    """
+    by_text, by_key, ambiguous = {}, {}, set()
+    for position, name in enumerate(table["name"].astype(str)):
+        tokens = normalize_name(name, column)
+        by_text.setdefault(" ".join(tokens), position)
+        key = model_key(tokens, column)
+        if not key:
+            continue
+        if key in by_key and by_key[key] != position:
+            ambiguous.add(key)
+        by_key.setdefault(key, position)
+    for key in ambiguous:
+        del by_key[key]
+    return by_text, by_key
+
+
+def match_components(names, table, column):
+    """
+    Find the benchmark row for every component name.
+
+    Names are matched on their normalised text first, then on their model key
+    (see model_key), so "Ryzen 7 7800X3D 4.2 GHz 8-Core" finds "Ryzen 7 7800X3D".
+    Only distinct names are normalised; the result is broadcast back with a
+    vectorised map.
+
+    Args:
+        names (pd.Series): Component names from the build table.
+        table (pd.DataFrame): Benchmark table for this column.
+        column (str): Dataset column name.
+
+    Returns:
+        pd.Series: Row position in table per name (float, NaN if unmatched).
+    """
+    by_text, by_key = _lookup_index(table, column)
+    positions = {}
+    for name in names.dropna().unique():
+        tokens = normalize_name(name, column)
+        position = by_text.get(" ".join(tokens))
+        key = model_key(tokens, column)
+        if position is None and key:
+            position = by_key.get(key)
+        positions[name] = np.nan if position is None else position
+    return names.map(positions).astype(float)
+
+
+def integrated_graphics_scores(table):
+    """(game, work) points for a build without a discrete GPU."""
+    rows = table[table["name"].astype(str).str.casefold() == INTEGRATED_GPU_NAME.casefold()]
+    if rows.empty:
+        return 0.0, 0.0
+    return float(rows["game"].iloc[0]), float(rows["work"].iloc[0])
+
+
+def memory_capacity_gb(names):
+    """Total memory capacity in GB parsed from titles like '32 GB (2 x 16 GB)'."""
+    return names.astype(str).str.extract(r"(\d+)\s*GB", expand=False).astype(float)
+
+
+def score_builds(df, tables):
+    """
+    Add Game Score and Work Score columns to a build table.
+
+    Args:
+        df (pd.DataFrame): Builds as written by save_to_csv.
+        tables (dict): Output of load_benchmarks.
+
+    Returns:
+        pd.DataFrame: Scored copy of df; rows whose CPU or video card has no
+        benchmark are dropped. Builds without a video card are scored with
+        integrated graphics instead.
+    """
+    df = df.copy()
+    game = np.zeros(len(df))
+    work = np.zeros(len(df))
+    matched = np.ones(len(df), dtype=bool)
+
+    for column, table in tables.items():
+        positions = match_components(df[column], table, column).to_numpy()
+        found = ~np.isnan(positions)
+        index = np.where(found, positions, 0).astype(int)
+        game_points = table["game"].to_numpy(dtype=float)[index]
+        work_points = table["work"].to_numpy(dtype=float)[index]
+        if column == "Video Card":
+            integrated = df[column].fillna("").astype(str).str.strip().eq("").to_numpy()
+            game_points[integrated], work_points[integrated] = integrated_graphics_scores(table)
+            found |= integrated
+        matched &= found
+        game += GAME_WEIGHTS[column] * game_points
+        work += WORK_WEIGHTS[column] * work_points
+
+    if "Memory" in df.columns:
+        capacity = memory_capacity_gb(df["Memory"]).fillna(0).to_numpy()
+        work += MEMORY_WORK_BONUS * np.minimum(capacity / MEMORY_FULL_BONUS_GB, 1.0)
+
+    df["Game Score"] = np.round(game, 2)
+    df["Work Score"] = np.round(work, 2)
+    if not matched.all():
+        logger.warning(f"Dropping {(~matched).sum()} builds without benchmark data")
+    return df[matched].copy()
+
+
+def row_keys(df):
+    """Stable per-row hash of the columns that identify a build."""
+    columns = [col for col in KEY_COLUMNS if col in df.columns]
+    return pd.util.hash_pandas_object(df[columns].astype(str), index=False)
+
+
+def scoring_fingerprint(tables):
+    """Hash of the benchmark tables and weights that produced a set of scores."""
+    digest = hashlib.sha256()
+    settings = {
+        "game_weights": GAME_WEIGHTS,
+        "work_weights": WORK_WEIGHTS,
+        "integrated_gpu_name": INTEGRATED_GPU_NAME,
+        "memory_work_bonus": MEMORY_WORK_BONUS,
+        "memory_full_bonus_gb": MEMORY_FULL_BONUS_GB,
+    }
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    for column in sorted(tables):
+        digest.update(column.encode())
+        digest.update(tables[column].to_csv(index=False).encode())
+    return digest.hexdigest()
+
+
+def fingerprint_path(output_path):
+    """Sidecar file recording the scoring fingerprint of output_path."""
+    return f"{os.path.splitext(output_path)[0]}.scoring.json"
+
+
+def read_fingerprint(output_path):
+    """Stored scoring fingerprint of output_path, or None if there is none."""
+    try:
+        with open(fingerprint_path(output_path)) as f:
+            return json.load(f).get("fingerprint")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def rescore(existing, tables):
+    """
+    Recompute the scores of an existing dataset in place of the stored ones.
+
+    Builds without benchmark data keep their previous scores, with a warning,
+    since those were computed on a different scale.
+    """
+    rescored = score_builds(existing, tables)
+    existing = existing.copy()
+    existing.loc[rescored.index, ["Game Score", "Work Score"]] = rescored[["Game Score", "Work Score"]]
+    stale = len(existing) - len(rescored)
+    if stale:
+        logger.warning(f"{stale} existing builds have no benchmark data and keep scores "
+                       f"from a different scale; fix the tables or remove them")
+    logger.info(f"Re-scored {len(rescored)} existing builds")
+    return existing
+
+
+def update_scored_dataset(parsed_path, output_path, tables, force_rescore=False):
+    """
+    Score only builds that are not yet in the output dataset and append them.
+
+    The fingerprint of the tables and weights is stored next to the output.
+    When it differs from the current one, or is missing for an existing
+    dataset, every existing build is re-scored first so that all rows share
+    one scale.
+
+    Args:
+        parsed_path (str): CSV written by save_to_csv.
+        output_path (str): Scored training dataset, created if missing.
+        tables (dict): Output of load_benchmarks.
+        force_rescore (bool): Re-score existing builds even if the fingerprint matches.
+
+    Returns:
+        int: Number of builds appended.
+    """
+    fingerprint = scoring_fingerprint(tables)
+    parsed = pd.read_csv(parsed_path)
+    changed = False
+    if os.path.exists(output_path):
+        existing = pd.read_csv(output_path)
+        stored = read_fingerprint(output_path)
+        if force_rescore or stored != fingerprint:
+            if stored is None:
+                logger.warning(f"{output_path} has no scoring fingerprint; re-scoring it")
+            elif stored != fingerprint:
+                logger.warning("Benchmark tables or weights changed since the last run; "
+                               f"re-scoring {output_path}")
+            existing = rescore(existing, tables)
+            changed = True
+        fresh = parsed[~row_keys(parsed).isin(set(row_keys(existing)))]
+    else:
+        existing = None
+        fresh = parsed
+    fresh = fresh.drop_duplicates(subset=[c for c in KEY_COLUMNS if c in fresh.columns])
+
+    appended = 0
+    if fresh.empty:
+        logger.info("No new builds to score")
+        scored = existing
+    else:
+        scored = score_builds(fresh, tables)
+        appended = len(scored)
+        if existing is not None:
+            next_id = int(existing["build_id"].max()) + 1 if len(existing) else 1
+            scored["build_id"] = np.arange(next_id, next_id + appended)
+            scored = pd.concat([existing, scored], ignore_index=True)
+        changed = True
+
+    if changed:
+        scored.to_csv(output_path, index=False)
+        logger.info(f"Appended {appended} scored builds to {output_path}")
+    if scored is not None and (changed or read_fingerprint(output_path) != fingerprint):
+        with open(fingerprint_path(output_path), "w") as f:
+            json.dump({"fingerprint": fingerprint}, f)
+    return appended
+
+
+def main():
+    """Score newly scraped builds into the training dataset."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", help="CSV written by save_to_csv")
+    parser.add_argument("--output", help="scored dataset (defaults to DATASET_PATH)")
+    parser.add_argument("--benchmarks", default=BENCHMARKS_DIR)
+    parser.add_argument("--rescore", action="store_true",
+                        help="re-score existing builds even if the tables are unchanged")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.output is None:
+        from config.settings import DATASET_PATH
+        args.output = DATASET_PATH
+
+    start = time.perf_counter()
+    appended = update_scored_dataset(args.input, args.output, load_benchmarks(args.benchmarks),
+                                     force_rescore=args.rescore)
+    print(f"Scored {appended} new builds in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,6 @@
 """Test script for running PCBuildModel recommendation."""
 
-import torch
-import joblib
-
-from model.pcbuild_model import PCBuildModel
 from bot.recommender import recommend_parts
-from config.settings import MODEL_PATH, ENCODERS_PATH
 import logging
 
 logging.basicConfig(
@@ -14,17 +9,7 @@ logging.basicConfig(
 )
 
 def main():
-    """Load model and encoders, then generate and print a PC build recommendation."""
-    encoders = joblib.load(ENCODERS_PATH)
-
-
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
-    model = PCBuildModel(encoders=encoders)
-    model.load_state_dict(torch.load(MODEL_PATH, map_location=device))
-    model.to(device)
-    model.eval()
-    
+    """Generate and print PC build recommendations with the recommender's loaded model."""
     for i in range(10):
         print(f"Test {i+1}:")
         price = 500 + i * 200
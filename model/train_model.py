@@ -12,6 +12,7 @@ from torch.utils.data import Dataset, DataLoader
 from .pcbuild_model import PCBuildModel  # або ./pcbuild_model, якщо запускаєш з локального каталогу
 import logging
 from config.settings import DATASET_PATH
+from data.canonicalize import apply_mapping, load_mapping
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,9 +31,37 @@ class BuildDataset(Dataset):
             for key, value in self.targets.items()
         }
 
+def train_epoch(model, train_loader, optimizer, loss_fn, device):
+    """
+    Run one training epoch.
+
+    Returns:
+        float: Mean loss over batches.
+    """
+    model.train()
+    total_loss = 0.0
+
+    for batch_x, batch_y in train_loader:
+        batch_x = batch_x.to(device)
+        batch_y = {k: v.to(device) for k, v in batch_y.items()}
+
+        predictions = model(batch_x)
+        losses = [loss_fn(predictions[k], batch_y[k]) for k in predictions]
+        loss = sum(losses)
+
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+
+        total_loss += loss.item()
+
+    return total_loss / len(train_loader)
+
 def main():
     """Main training loop for PCBuildModel."""
     df = pd.read_csv(DATASET_PATH)
+    # Merge vendor/edition variants so each part is one class (see data/canonicalize.py).
+    df = apply_mapping(df, load_mapping())
     df["is_top_segment"] = (df["Total Price"] >= 4500).astype(float)
     categorical_columns = ["CPU", "Motherboard", "Memory", "Video Card", "Power Supply"]
     numeric_columns = ["Total Price", "Game Score", "Work Score", "is_top_segment"]
@@ -57,24 +86,8 @@ def main():
     loss_fn = nn.CrossEntropyLoss()
 
     for epoch in range(100):
-        model.train()
-        total_loss = 0.0
-
-        for batch_x, batch_y in train_loader:
-            batch_x = batch_x.to(device)
-            batch_y = {k: v.to(device) for k, v in batch_y.items()}
-
-            predictions = model(batch_x)
-            losses = [loss_fn(predictions[k], batch_y[k]) for k in predictions]
-            loss = sum(losses)
-
-            optimizer.zero_grad()
-            loss.backward()
-            optimizer.step()
-
-            total_loss += loss.item()
-
-        print(f"Epoch {epoch + 1}, Loss: {total_loss / len(train_loader):.4f}")
+        epoch_loss = train_epoch(model, train_loader, optimizer, loss_fn, device)
+        print(f"Epoch {epoch + 1}, Loss: {epoch_loss:.4f}")
 
     torch.save(model.state_dict(), "model/pcbuild_model.pt")
     with open("model/encoders.pkl", "wb") as file:
@@ -0,0 +1,353 @@
+"""Per-stage timers, counters and Prometheus text export for the request path."""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Instrumentation is off unless PCBOT_METRICS=1; timers then cost one flag check.
+ENABLED = os.getenv("PCBOT_METRICS", "0") == "1"
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+def enable():
+    """Turn instrumentation on at runtime."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    """Turn instrumentation off at runtime."""
+    global ENABLED
+    ENABLED = False
+
+
+def _format_labels(names, values):
+    """Render a Prometheus label set, e.g. {stage="forward"}."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _HistogramChild:
+    """Bucketed observations for one label set."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Record a single observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        """Return consistent copies of (counts, sum, count)."""
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation within buckets.
+
+        Args:
+            q (float): Quantile in [0, 1].
+
+        Returns:
+            float: Estimated value, or 0.0 with no observations.
+        """
+        counts, _, total = self.snapshot()
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+class Histogram:
+    """Prometheus-style histogram keyed by label values."""
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Return the child histogram for the given label values."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def observe(self, value, *values):
+        """Record an observation for the given label values."""
+        self.labels(*values).observe(value)
+
+    def children(self):
+        """Return a snapshot of label values to child histograms."""
+        with self._lock:
+            return dict(self._children)
+
+    def reset(self):
+        """Drop all observations."""
+        with self._lock:
+            self._children = {}
+
+    def render(self):
+        """Render the histogram in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, child in sorted(self.children().items()):
+            counts, total_sum, total_count = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labelnames + ("le",), values + (le,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {total_sum}")
+            lines.append(f"{self.name}_count{labels} {total_count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *values):
+        """Increase the counter for the given label values."""
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def value(self, *values):
+        """Return the current value for the given label values."""
+        return self._values.get(values, 0)
+
+    def reset(self):
+        """Drop all values."""
+        with self._lock:
+            self._values = {}
+
+    def render(self):
+        """Render the counter in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        # Render runs on the HTTP/dump threads while the event loop adds label sets.
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {value}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Create or return a histogram."""
+        return self._metrics.setdefault(name, Histogram(name, help_text, labelnames, buckets))
+
+    def counter(self, name, help_text, labelnames=()):
+        """Create or return a counter."""
+        return self._metrics.setdefault(name, Counter(name, help_text, labelnames))
+
+    def reset(self):
+        """Drop all recorded values, e.g. between benchmark runs."""
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def render(self):
+        """Render every metric in Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.histogram(
+    "pcbot_stage_duration_seconds", "Time spent in each request stage.", ("stage",)
+)
+LLM_ERRORS = REGISTRY.counter(
+    "pcbot_llm_errors_total", "LLM calls that raised an error.", ("call",)
+)
+PARSE_FAILURES = REGISTRY.counter(
+    "pcbot_llm_parse_failures_total", "LLM responses that could not be parsed."
+)
+LLM_FALLBACKS = REGISTRY.counter(
+    "pcbot_llm_fallbacks_total", "Advice served by the local generator, by reason.", ("reason",)
+)
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "pcbot_circuit_breaker_transitions_total", "LLM circuit breaker state changes.", ("state",)
+)
+OUTBOX_MESSAGES = REGISTRY.counter(
+    "pcbot_outbox_messages_total",
+    "Outgoing message delivery attempts by result (delivered, retry, retry_after, dropped).",
+    ("result",),
+)
+NLP_CACHE_LOOKUPS = REGISTRY.counter(
+    "pcbot_nlp_cache_lookups_total", "extract_price_task cache lookups by result.", ("result",)
+)
+SPECULATIONS = REGISTRY.counter(
+    "pcbot_speculations_total",
+    "Speculative recommendations by outcome (hit, miss, error, skipped).",
+    ("outcome",),
+)
+SPECULATION_WASTED_CALLS = REGISTRY.counter(
+    "pcbot_speculation_wasted_advice_calls_total",
+    "Speculative generate_recommendations calls whose result was discarded.",
+)
+SPECULATION_SAVED_SECONDS = REGISTRY.histogram(
+    "pcbot_speculation_saved_seconds", "Latency removed from the critical path by a hit."
+)
+
+
+class _StageTimer:
+    """Context manager that records elapsed time for a stage."""
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, self.stage)
+        return False
+
+
+class _NullTimer:
+    """Shared no-op timer used while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage):
+    """
+    Time a block of code as a named stage.
+
+    Args:
+        stage (str): Stage label, e.g. "recommend_parts.forward".
+
+    Returns:
+        Context manager recording the elapsed time when enabled.
+    """
+    return _StageTimer(stage) if ENABLED else _NULL_TIMER
+
+
+def count(counter, *labels):
+    """Increment a counter when instrumentation is enabled."""
+    if ENABLED:
+        counter.inc(1, *labels)
+
+
+def render_prometheus():
+    """Return all metrics in Prometheus text exposition format."""
+    return REGISTRY.render()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve the registry on GET /metrics."""
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """
+    Serve /metrics from a daemon thread.
+
+    Args:
+        port (int): TCP port to listen on.
+        host (str): Interface to bind; loopback only unless set explicitly.
+
+    Returns:
+        ThreadingHTTPServer: The running server.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    logger.info(f"Metrics endpoint listening on {host}:{port}/metrics")
+    return server
+
+
+def start_periodic_dump(interval, path=None):
+    """
+    Periodically write the metrics text to a file or the log.
+
+    Args:
+        interval (float): Seconds between dumps.
+        path (str | None): File to overwrite; logs at INFO when None.
+
+    Returns:
+        threading.Event: Set it to stop dumping.
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            text = render_prometheus()
+            if path:
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(text)
+            else:
+                logger.info(f"Metrics snapshot:\n{text}")
+
+    threading.Thread(target=run, daemon=True, name="metrics-dump").start()
+    return stop
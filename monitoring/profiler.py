@@ -0,0 +1,97 @@
+"""Opt-in sampling profiler for handler coroutines."""
+
+import functools
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Sampling is off unless PCBOT_PROFILE=1.
+ENABLED = os.getenv("PCBOT_PROFILE", "0") == "1"
+INTERVAL = float(os.getenv("PCBOT_PROFILE_INTERVAL", "0.005"))
+OUTPUT_PATH = os.getenv("PCBOT_PROFILE_OUTPUT", "profile.folded")
+
+
+class SamplingProfiler:
+    """
+    Periodically sample the stack of one thread and count collapsed stacks.
+
+    The output is in the "folded" format understood by flamegraph.pl and
+    speedscope: one "frame;frame;frame count" line per distinct stack.
+    """
+
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self._active = 0
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._sampler = None
+        self._lock = threading.Lock()
+
+    def _collapse(self, frame):
+        """Turn a frame chain into a root-first semicolon separated stack."""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_filename.rsplit(os.sep, 1)[-1]}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.samples[self._collapse(frame)] += 1
+
+    def start(self):
+        """Begin sampling the calling thread; nested calls are reference counted."""
+        with self._lock:
+            self._active += 1
+            if self._active > 1:
+                return
+            self._thread_id = threading.get_ident()
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._run, daemon=True, name="profiler")
+            self._sampler.start()
+
+    def stop(self):
+        """Stop sampling once the last active section ends."""
+        with self._lock:
+            self._active -= 1
+            if self._active > 0:
+                return
+            self._stop.set()
+        self._sampler.join()
+
+    def dump(self, path=OUTPUT_PATH):
+        """Write the collected samples in folded-stack format."""
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.samples.most_common():
+                file.write(f"{stack} {count}\n")
+        logger.info(f"Wrote {sum(self.samples.values())} profile samples to {path}")
+
+
+PROFILER = SamplingProfiler()
+
+
+def profile_handler(func):
+    """
+    Sample the event loop thread while the decorated coroutine runs.
+
+    Concurrent handlers share one sampler, so samples cover everything the
+    loop executes while at least one profiled handler is in flight.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return await func(*args, **kwargs)
+        PROFILER.start()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            PROFILER.stop()
+    return wrapper
@@ -0,0 +1,110 @@
+"""Circuit breaker guarding calls to the LLM API."""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Permits returned by CircuitBreaker.allow.
+CALL = "call"
+PROBE = "probe"
+
+
+class CircuitBreaker:
+    """
+    Stop calling a dependency after repeated failures and probe to recover.
+
+    Timeouts, errors and calls slower than slow_call_threshold all count as
+    failures. After failure_threshold consecutive failures the breaker opens
+    and rejects calls for reset_timeout seconds, then lets a single probe
+    through; a good probe closes it again, a bad one reopens it. Only the
+    probe's outcome changes a half-open breaker: results of calls admitted
+    before the breaker opened are ignored once it is no longer closed.
+    """
+
+    def __init__(self, failure_threshold=5, slow_call_threshold=4.0, reset_timeout=30.0,
+                 on_transition=None):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker.
+            slow_call_threshold (float): Seconds after which a success counts as a failure.
+            reset_timeout (float): Seconds to stay open before probing.
+            on_transition (callable | None): Called with the new state name.
+        """
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.on_transition = on_transition
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state):
+        if state == self.state:
+            return
+        logger.warning(f"LLM circuit breaker {self.state} -> {state}")
+        self.state = state
+        if self.on_transition:
+            self.on_transition(state)
+
+    def allow(self):
+        """
+        Ask whether a call may be attempted now.
+
+        Returns:
+            str | None: CALL or PROBE if the call may go ahead, None if it is
+            rejected. Pass the permit back to record_success, record_failure
+            or release.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return CALL
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return None
+                self._transition(HALF_OPEN)
+            if self._probe_in_flight:
+                return None
+            self._probe_in_flight = True
+            return PROBE
+
+    def record_success(self, elapsed, permit=CALL):
+        """Record a completed call and how long it took."""
+        if elapsed > self.slow_call_threshold:
+            self.record_failure(permit)
+            return
+        with self._lock:
+            if permit == PROBE:
+                self._probe_in_flight = False
+                self.failures = 0
+                self._transition(CLOSED)
+            elif self.state == CLOSED:
+                self.failures = 0
+
+    def release(self, permit=CALL):
+        """Forget an allowed call that was cancelled before it completed."""
+        if permit != PROBE:
+            return
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, permit=CALL):
+        """Record a failed, timed out or too slow call."""
+        with self._lock:
+            if permit == PROBE:
+                self._probe_in_flight = False
+            elif self.state != CLOSED:
+                return
+            self.failures += 1
+            if permit == PROBE or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._transition(OPEN)
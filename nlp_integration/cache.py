@@ -0,0 +1,153 @@
+"""Bounded TTL/LRU cache for validated budget/task extraction results."""
+
+import json
+import logging
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+VALID_TASKS = ("games", "work")
+# Numbers are kept verbatim ("1200" and "1 200" stay different keys), currency
+# symbols are kept as tokens, all other punctuation, emoji and spacing is dropped.
+TOKEN_PATTERN = re.compile(r"\d+(?:[.,]\d+)*|[$€£₴]|[^\W\d_]+")
+
+
+def canonicalize(text: str) -> str:
+    """
+    Reduce a user message to a cache key.
+
+    Args:
+        text (str): Raw user message.
+
+    Returns:
+        str: Space-joined casefolded tokens.
+    """
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(TOKEN_PATTERN.findall(normalized))
+
+
+def validate_extraction(data):
+    """
+    Check a parsed LLM answer and normalise it.
+
+    Args:
+        data: Object decoded from the LLM JSON response.
+
+    Returns:
+        dict | None: {"price": float, "task": str | None}, or None if the
+        answer has no usable positive price. A missing or unknown task
+        becomes None, which the recommender treats as a mixed workload.
+    """
+    if not isinstance(data, dict):
+        return None
+    price, task = data.get("price"), data.get("task")
+    if isinstance(price, bool) or not isinstance(price, (int, float)):
+        return None
+    if not math.isfinite(price) or price <= 0:
+        return None
+    return {"price": float(price), "task": task if task in VALID_TASKS else None}
+
+
+class ExtractionCache:
+    """LRU cache with per-entry expiry and optional JSON persistence."""
+
+    def __init__(self, maxsize=10000, ttl=86400.0, path=None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries; 0 disables caching.
+            ttl (float): Seconds an entry stays valid.
+            path (str | None): JSON file to load from and save to.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return a copy of a live entry, or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(self, key, value):
+        """Store a validated result, evicting the least recently used entry."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.time() + self.ttl, dict(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and statistics."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def load(self):
+        """Load unexpired entries from the persistence file, if present."""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                stored = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable NLP cache {self.path}: {error}")
+            return
+        if not isinstance(stored, list):
+            logger.warning(f"Ignoring NLP cache {self.path}: expected a list of entries")
+            return
+        now = time.time()
+        skipped = 0
+        for row in stored:
+            if not (isinstance(row, list) and len(row) == 3 and isinstance(row[0], str)
+                    and isinstance(row[1], (int, float)) and not isinstance(row[1], bool)):
+                skipped += 1
+                continue
+            key, expires_at, value = row
+            value = validate_extraction(value)
+            if value is None:
+                skipped += 1
+            elif expires_at > now:
+                self._entries[key] = (expires_at, value)
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed entries in NLP cache {self.path}")
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        logger.info(f"Loaded {len(self._entries)} NLP cache entries from {self.path}")
+
+    def save(self):
+        """Write live entries to the persistence file atomically."""
+        if not self.path:
+            return
+        now = time.time()
+        stored = [[key, expires_at, value]
+                  for key, (expires_at, value) in self._entries.items() if expires_at > now]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(stored, file, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,167 @@
+"""Local rule-based build advice used when the LLM is slow or unavailable."""
+
+import functools
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATTERN = re.compile(r"\b(AM4|AM5|LGA\s?\d{4})\b", re.IGNORECASE)
+CHIPSET_PATTERN = re.compile(r"\b([ABHXZ]\d{3})[A-Z]?\b", re.IGNORECASE)
+CHIPSET_SOCKETS = {
+    "A620": "AM5", "B650": "AM5", "B850": "AM5", "X670": "AM5", "X870": "AM5",
+    "A520": "AM4", "B450": "AM4", "B550": "AM4", "X470": "AM4", "X570": "AM4",
+    "B660": "LGA1700", "B760": "LGA1700", "H610": "LGA1700", "H670": "LGA1700",
+    "H770": "LGA1700", "Z690": "LGA1700", "Z790": "LGA1700",
+    "B860": "LGA1851", "H810": "LGA1851", "Z890": "LGA1851",
+}
+FORM_FACTORS = [
+    (re.compile(r"\bE-?ATX\b", re.IGNORECASE), "E-ATX"),
+    (re.compile(r"\b(Micro|m)\s?-?ATX\b", re.IGNORECASE), "Micro ATX"),
+    (re.compile(r"\bMini\s?-?ITX\b", re.IGNORECASE), "Mini ITX"),
+    (re.compile(r"\bATX\b", re.IGNORECASE), "ATX"),
+]
+# First match wins; values are typical package power in watts.
+CPU_TDP = [
+    (re.compile(r"x3d", re.IGNORECASE), 120),
+    (re.compile(r"ryzen 9 \d{4}x\b", re.IGNORECASE), 170),
+    (re.compile(r"ryzen [57] \d{4}x\b", re.IGNORECASE), 105),
+    (re.compile(r"ryzen", re.IGNORECASE), 65),
+    (re.compile(r"(i9|i7|ultra [79])\b.*\d{3,5}k", re.IGNORECASE), 253),
+    (re.compile(r"(i5|ultra 5)\b.*\d{3,5}k", re.IGNORECASE), 181),
+    (re.compile(r"(i9|i7|ultra [79])\b", re.IGNORECASE), 219),
+    (re.compile(r"core", re.IGNORECASE), 65),
+]
+DEFAULT_TDP = 125
+CERTIFICATION_PATTERN = re.compile(r"80\s?\+\s?(Titanium|Platinum|Gold|Silver|Bronze)?",
+                                   re.IGNORECASE)
+WATTAGE_PATTERN = re.compile(r"(\d{3,4})\s?W\b")
+
+
+def _most_common_by(df, key_column, value_column):
+    """Most frequent value_column value for every key_column value."""
+    if key_column not in df.columns or value_column not in df.columns:
+        return {}
+    pairs = df[[key_column, value_column]].dropna()
+    if pairs.empty:
+        return {}
+    counts = pairs.groupby([key_column, value_column]).size().reset_index(name="count")
+    top = counts.sort_values("count", ascending=False).drop_duplicates(key_column)
+    return dict(zip(top[key_column], top[value_column]))
+
+
+def build_component_metadata(df):
+    """
+    Derive per-component hints from the builds dataset.
+
+    Args:
+        df (pd.DataFrame): Builds with canonical component names.
+
+    Returns:
+        dict: "cooler_by_cpu" and "case_by_motherboard" lookups of the most
+        common companion part in real builds.
+    """
+    return {
+        "cooler_by_cpu": _most_common_by(df, "CPU", "CPU Cooler"),
+        "case_by_motherboard": _most_common_by(df, "Motherboard", "Case"),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def load_component_metadata():
+    """Build metadata once from the configured dataset."""
+    import pandas as pd
+
+    from config.settings import DATASET_PATH
+    from data.canonicalize import apply_mapping, load_mapping
+
+    try:
+        df = apply_mapping(pd.read_csv(DATASET_PATH), load_mapping())
+    except OSError as error:
+        logger.warning(f"Fallback advice without dataset metadata: {error}")
+        return {"cooler_by_cpu": {}, "case_by_motherboard": {}}
+    return build_component_metadata(df)
+
+
+def detect_socket(build):
+    """Socket from the motherboard or CPU name, or via the chipset."""
+    for name in (build.get("Motherboard", ""), build.get("CPU", "")):
+        match = SOCKET_PATTERN.search(name)
+        if match:
+            return match.group(1).upper().replace(" ", "")
+    chipset = CHIPSET_PATTERN.search(build.get("Motherboard", ""))
+    if chipset:
+        return CHIPSET_SOCKETS.get(chipset.group(1).upper())
+    return None
+
+
+def detect_form_factor(motherboard):
+    """Motherboard form factor parsed from its name, ATX if unknown."""
+    for pattern, form_factor in FORM_FACTORS:
+        if pattern.search(motherboard):
+            return form_factor
+    return "ATX"
+
+
+def estimate_tdp(cpu):
+    """Typical CPU power draw in watts based on its model name."""
+    for pattern, tdp in CPU_TDP:
+        if pattern.search(cpu):
+            return tdp
+    return DEFAULT_TDP
+
+
+def recommend_certification(power_supply):
+    """PSU certification to recommend, keeping at least Gold for 850 W and above."""
+    match = CERTIFICATION_PATTERN.search(power_supply)
+    certification = (match.group(1) or "").title() if match else ""
+    wattage = WATTAGE_PATTERN.search(power_supply)
+    if wattage and int(wattage.group(1)) >= 850 and certification in ("", "Bronze", "Silver"):
+        return "Gold"
+    return certification or "Bronze"
+
+
+def recommend_fans(build):
+    """Number of case fans for the build's expected heat output."""
+    wattage = WATTAGE_PATTERN.search(build.get("Power Supply", ""))
+    watts = int(wattage.group(1)) if wattage else 650
+    if watts >= 1000:
+        return 6
+    if watts >= 750:
+        return 4
+    return 3
+
+
+def local_recommendations(build, metadata=None):
+    """
+    Produce the same four-line advice as the LLM prompt asks for.
+
+    Args:
+        build (dict): Recommended components from recommend_parts.
+        metadata (dict | None): Output of build_component_metadata;
+            loaded from the dataset when omitted.
+
+    Returns:
+        str: Cooler, case, fans and PSU certification lines.
+    """
+    metadata = metadata if metadata is not None else load_component_metadata()
+    cpu = build.get("CPU", "")
+    motherboard = build.get("Motherboard", "")
+
+    socket = detect_socket(build)
+    cooler = f"{estimate_tdp(cpu)}W TDP" + (f", {socket}" if socket else "")
+    example_cooler = metadata["cooler_by_cpu"].get(cpu)
+    if example_cooler:
+        cooler += f" (напр. {example_cooler})"
+
+    case = detect_form_factor(motherboard)
+    example_case = metadata["case_by_motherboard"].get(motherboard)
+    if example_case:
+        case += f" (напр. {example_case})"
+
+    return (
+        f"- Кулер: {cooler}\n"
+        f"- Корпус: {case}\n"
+        f"- Вентилятори: {recommend_fans(build)}\n"
+        f"- PSU сертифікація: 80+ {recommend_certification(build.get('Power Supply', ''))}"
+    )
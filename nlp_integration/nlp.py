@@ -1,17 +1,67 @@
 """NLP integration with Groq API (LLaMA3)."""
 import asyncio
+import atexit
 import json
+import os
+import re
+import time
 from concurrent.futures import ThreadPoolExecutor
 import groq
 from config.settings import GROQ_API_KEY
+from monitoring.metrics import (
+    BREAKER_TRANSITIONS, LLM_ERRORS, LLM_FALLBACKS, NLP_CACHE_LOOKUPS, PARSE_FAILURES, count
+)
+from .breaker import CircuitBreaker
+from .cache import ExtractionCache, canonicalize, validate_extraction
+from .fallback import local_recommendations
 import logging
 
 logger = logging.getLogger(__name__)
 CLIENT = groq.Groq(api_key=GROQ_API_KEY)
 EXECUTOR = ThreadPoolExecutor()
+# Advice calls get their own bounded pool: a timed-out request keeps its thread
+# until Groq answers, and during a stall those threads must not starve extraction.
+# Same default size as EXECUTOR, so isolation does not cost advice throughput.
+ADVICE_WORKERS = int(os.getenv("PCBOT_ADVICE_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+ADVICE_EXECUTOR = ThreadPoolExecutor(max_workers=ADVICE_WORKERS, thread_name_prefix="advice")
+CACHE = ExtractionCache(
+    maxsize=int(os.getenv("PCBOT_NLP_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("PCBOT_NLP_CACHE_TTL", "86400")),
+    path=os.getenv("PCBOT_NLP_CACHE_PATH"),
+)
+if CACHE.path:
+    atexit.register(CACHE.save)
+# Hard upper bound on an advice request before the local generator takes over.
+LLM_TIMEOUT = float(os.getenv("PCBOT_LLM_TIMEOUT", "8"))
+# Upper bound on extraction; a timed-out extraction is answered like an unparseable one.
+EXTRACT_TIMEOUT = float(os.getenv("PCBOT_EXTRACT_TIMEOUT", "8"))
+BREAKER = CircuitBreaker(
+    failure_threshold=int(os.getenv("PCBOT_BREAKER_FAILURES", "5")),
+    slow_call_threshold=float(os.getenv("PCBOT_BREAKER_SLOW_CALL", "4")),
+    reset_timeout=float(os.getenv("PCBOT_BREAKER_RESET", "30")),
+    on_transition=lambda state: count(BREAKER_TRANSITIONS, state),
+)
+# The model sometimes wraps the JSON object in prose or code fences.
+JSON_OBJECT_PATTERN = re.compile(r"\{.*?\}", re.DOTALL)
 
 async def extract_price_task(text: str):
-    """Extract budget and task type from user input."""
+    """
+    Extract budget and task type from user input.
+
+    Results are memoised on a canonical form of the text; only answers that
+    pass validation are cached. The LLM call is bounded by EXTRACT_TIMEOUT.
+
+    Returns:
+        dict | None: {"price": float, "task": "games" | "work" | None} or None
+        when no budget could be extracted.
+    """
+    key = canonicalize(text)
+    cached = CACHE.get(key)
+    if cached is not None:
+        count(NLP_CACHE_LOOKUPS, "hit")
+        return cached
+    count(NLP_CACHE_LOOKUPS, "miss")
+
     prompt = (
         f'"{text}"\n'
         'Витягни тільки бюджет (число з грошовою одиницею або без) і тип задачі (ігри або робота) і поверни **тільки** JSON з цими даними без пояснень.\n'
@@ -28,11 +78,37 @@ async def extract_price_task(text: str):
         logger.info(f"NLP raw response: {response.choices[0].message.content!r}")
         return response.choices[0].message.content
 
-    result = await asyncio.get_event_loop().run_in_executor(EXECUTOR, request)
-    return json.loads(result)
+    try:
+        result = await asyncio.wait_for(
+            asyncio.get_event_loop().run_in_executor(EXECUTOR, request), EXTRACT_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        count(LLM_ERRORS, "extract_price_task")
+        logger.warning(f"Extraction exceeded {EXTRACT_TIMEOUT}s")
+        return None
+    except Exception:
+        count(LLM_ERRORS, "extract_price_task")
+        raise
+    match = JSON_OBJECT_PATTERN.search(result or "")
+    try:
+        data = json.loads(match.group() if match else result)
+    except (TypeError, json.JSONDecodeError):
+        count(PARSE_FAILURES)
+        logger.warning(f"Could not parse NLP response as JSON: {result!r}")
+        return None
+
+    data = validate_extraction(data)
+    if data is not None:
+        CACHE.put(key, data)
+    return data
 
 async def generate_recommendations(build: dict) -> str:
-    """Generate LLM-based recommendations for given PC build."""
+    """
+    Generate LLM-based recommendations for given PC build.
+
+    Falls back to local rule-based advice when the circuit breaker is open,
+    the call fails or it exceeds LLM_TIMEOUT.
+    """
     prompt = (
         f"Збірка:\n"
         f"CPU: {build['CPU']}\n"
@@ -56,4 +132,32 @@ async def generate_recommendations(build: dict) -> str:
         )
         return response.choices[0].message.content
 
-    return await asyncio.get_event_loop().run_in_executor(EXECUTOR, request)
+    permit = BREAKER.allow()
+    if permit is None:
+        count(LLM_FALLBACKS, "breaker_open")
+        return local_recommendations(build)
+
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(
+            asyncio.get_event_loop().run_in_executor(ADVICE_EXECUTOR, request), LLM_TIMEOUT
+        )
+    except asyncio.CancelledError:
+        # The caller gave up (e.g. a discarded speculation). That says nothing
+        # about the LLM, but a half-open probe must be released or the breaker
+        # would never let another call through.
+        BREAKER.release(permit)
+        raise
+    except asyncio.TimeoutError:
+        BREAKER.record_failure(permit)
+        count(LLM_FALLBACKS, "timeout")
+        logger.warning(f"Advice request exceeded {LLM_TIMEOUT}s, using local advice")
+        return local_recommendations(build)
+    except Exception as error:
+        BREAKER.record_failure(permit)
+        count(LLM_ERRORS, "generate_recommendations")
+        count(LLM_FALLBACKS, "error")
+        logger.warning(f"Advice request failed ({error}), using local advice")
+        return local_recommendations(build)
+    BREAKER.record_success(time.perf_counter() - start, permit)
+    return result
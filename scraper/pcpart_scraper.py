@@ -35,16 +35,6 @@ UC_PATCHED_DRIVER_PATH = os.path.expanduser(
     "~/.undetected_chromedriver/undetected_chromedriver.exe"
 )
 
-# === Logging ===
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("scraper.log", mode="w", encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
-
 # === Utility Functions ===
 
 def random_delay(min_seconds=2, max_seconds=5):
@@ -115,6 +105,48 @@ def parse_price(price_str):
         return 0.0
 
 
+def parse_partlist(tbody):
+    """
+    Extract components from the part list table of a build page.
+
+    Args:
+        tbody: WebElement (or compatible object) for the part list <tbody>.
+
+    Returns:
+        list: Component dictionaries, or an empty list if any kept row
+        lacks a name or price and the build must be skipped.
+    """
+    current_category = None
+    components = []
+
+    for row in tbody.find_elements(By.TAG_NAME, "tr"):
+        try:
+            category_cell = row.find_element(By.CLASS_NAME, "td__component")
+            if category_cell.get_attribute("colspan") == "2":
+                current_category = category_cell.find_element(By.TAG_NAME, "h4").text.strip()
+                continue
+        except NoSuchElementException:
+            pass
+
+        if current_category in SKIP_COMPONENTS:
+            continue
+
+        try:
+            name_cell = row.find_element(By.CLASS_NAME, "td__name")
+            price_cell = row.find_element(By.CLASS_NAME, "td__price")
+            name = name_cell.find_element(By.TAG_NAME, "a").text.strip()
+            price = price_cell.text.strip()
+            components.append({
+                "category": current_category,
+                "name": name,
+                "price": price
+            })
+        except NoSuchElementException:
+            return []
+
+    return components
+
+
 def process_page(page_num, window_index):
     """
     Scrape all builds from a specific page number.
@@ -158,39 +190,9 @@ def process_page(page_num, window_index):
                 wait.until(EC.presence_of_element_located((By.CLASS_NAME, "partlist")))
 
                 tbody = driver.find_element(By.CSS_SELECTOR, "tbody")
-                rows = tbody.find_elements(By.TAG_NAME, "tr")
-
-                current_category = None
-                components = []
-                skip_build = False
-
-                for row in rows:
-                    try:
-                        category_cell = row.find_element(By.CLASS_NAME, "td__component")
-                        if category_cell.get_attribute("colspan") == "2":
-                            current_category = category_cell.find_element(By.TAG_NAME, "h4").text.strip()
-                            continue
-                    except NoSuchElementException:
-                        pass
-
-                    if current_category in SKIP_COMPONENTS:
-                        continue
-
-                    try:
-                        name_cell = row.find_element(By.CLASS_NAME, "td__name")
-                        price_cell = row.find_element(By.CLASS_NAME, "td__price")
-                        name = name_cell.find_element(By.TAG_NAME, "a").text.strip()
-                        price = price_cell.text.strip()
-                        components.append({
-                            "category": current_category,
-                            "name": name,
-                            "price": price
-                        })
-                    except NoSuchElementException:
-                        skip_build = True
-                        break
-
-                if not skip_build and components:
+                components = parse_partlist(tbody)
+
+                if components:
                     builds.append(components)
                     LOGGER.info(f"Added build from {link}")
 
@@ -245,6 +247,15 @@ def save_to_csv(all_builds, filename="../data/parsed_data/parsed_builds.csv"):
 # === Main ===
 
 if __name__ == "__main__":
+    # Configured here so importing the parser (e.g. from benchmarks) leaves scraper.log alone.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("scraper.log", mode="w", encoding="utf-8"),
+            logging.StreamHandler()
+        ]
+    )
     clean_chrome_profiles()
 
     all_builds = []